@@ -0,0 +1,106 @@
+"""Stress benchmark for several ticket counters sharing one FerrySystem
+
+    python benchmarks/bench_counters.py [--travelers 20000] [--counters 1 2 4 8]
+
+Each counter is a thread that registers its share of travelers, pays
+every other one and boards every fourth. Ticket images are not rendered,
+so the numbers cover the shared-state path only: ID allocation, the
+traveler table, sailings, events and journaling stay in memory.
+Afterwards the run is checked for duplicate IDs and lost updates.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ferry_boarding import TicketSigner
+from ferry_core import DESTINATIONS, STATUSES, FerrySystem
+from ferry_table import FLAG_BOARDED
+
+DEPARTURES = ("06:00", "08:30", "11:00", "14:30")
+
+class SkipRenderExecutor:
+    """Executor stand-in that completes every render job without drawing it"""
+    def submit(self, fn, *args):
+        job = Future()
+        job.set_result(None)
+        return job
+
+    def shutdown(self, wait=True):
+        pass
+
+def run_counter(system, counter, count, barrier, ids):
+    barrier.wait()
+    for i in range(count):
+        traveler_id, _ = system.register_traveler(
+            f"Counter {counter} traveler {i}", STATUSES[i % len(STATUSES)], i % 3 == 0,
+            DESTINATIONS[i % len(DESTINATIONS)], i % 7 == 0, DEPARTURES[i % len(DEPARTURES)])
+        ids.append(traveler_id)
+        if i % 2 == 0:
+            system.mark_as_paid(traveler_id)
+        if i % 4 == 0:
+            system.mark_boarded(traveler_id)
+
+def run(travelers, counters, qr_folder):
+    system = FerrySystem(render_executor=SkipRenderExecutor(), qr_folder=qr_folder,
+                         signer=TicketSigner(key=b"bench"))
+    for destination in DESTINATIONS:
+        for departure in DEPARTURES:
+            system.set_capacity(destination, departure, travelers)
+
+    per_counter = travelers // counters
+    barrier = threading.Barrier(counters + 1)
+    results = [[] for _ in range(counters)]
+    threads = [threading.Thread(target=run_counter, args=(system, n, per_counter, barrier, results[n]))
+               for n in range(counters)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    # Every registration, payment and boarding must be accounted for exactly once
+    ids = [traveler_id for ids in results for traveler_id in ids]
+    expected_paid = counters * ((per_counter + 1) // 2)
+    expected_boarded = counters * ((per_counter + 3) // 4)
+    boarded = sum(1 for flags in system.travelers.flags if flags & FLAG_BOARDED)
+    booked = sum(sailing.booked for sailing in system.sailings)
+    problems = []
+    if len(set(ids)) != len(ids):
+        problems.append(f"{len(ids) - len(set(ids))} duplicate IDs")
+    if len(system.travelers) != len(ids) or booked != len(ids):
+        problems.append(f"{len(ids)} registered, {len(system.travelers)} rows, {booked} seats")
+    if system.travelers.count(is_paid=True) != expected_paid:
+        problems.append(f"paid count {system.travelers.count(is_paid=True)}, expected {expected_paid}")
+    if boarded != expected_boarded:
+        problems.append(f"boarded count {boarded}, expected {expected_boarded}")
+    system.shutdown()
+    return len(ids) / elapsed, problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--travelers", type=int, default=20000)
+    parser.add_argument("--counters", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'counters':>8} {'travelers/s':>12} {'vs 1':>6}  check")
+    baseline = None
+    with tempfile.TemporaryDirectory() as qr_folder:
+        for counters in args.counters:
+            rate, problems = run(args.travelers, counters, qr_folder)
+            baseline = baseline or rate
+            failed = failed or bool(problems)
+            print(f"{counters:>8} {rate:>12.0f} {rate / baseline:>5.2f}x  {'; '.join(problems) or 'ok'}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
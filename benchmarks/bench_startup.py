@@ -0,0 +1,60 @@
+"""Import-time benchmark for the ferry startup path
+
+    python benchmarks/bench_startup.py [--runs 15]
+
+Every case runs in a fresh interpreter. "eager" imports the set of
+modules ferry.py used to load up front (customtkinter, PIL, qrcode,
+concurrent.futures, theme setup), so the differences show what the lazy
+imports save.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = {
+    "ferry_core": "import ferry_core",
+    "ferry": "import ferry",
+    "ferry_gui": "import ferry_gui",
+    "eager": (
+        "import ferry_gui, json, qrcode\n"
+        "from concurrent.futures import ThreadPoolExecutor\n"
+        "from PIL import Image, ImageDraw, ImageFont, ImageTk\n"
+        "import customtkinter as ctk\n"
+        "ctk.set_appearance_mode('light')\n"
+        "ctk.set_default_color_theme('green')"
+    ),
+}
+
+TIMER = "import time\n_t = time.perf_counter()\n{stmt}\nprint(time.perf_counter() - _t)"
+
+def time_import(stmt):
+    out = subprocess.run([sys.executable, "-c", TIMER.format(stmt=stmt)], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    return float(out.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    # One untimed pass so every case sees a warm filesystem cache
+    for stmt in CASES.values():
+        time_import(stmt)
+
+    medians = {}
+    print(f"{'case':<12} {'median ms':>10} {'min ms':>8}")
+    for name, stmt in CASES.items():
+        samples = [time_import(stmt) * 1000 for _ in range(args.runs)]
+        medians[name] = statistics.median(samples)
+        print(f"{name:<12} {medians[name]:>10.1f} {min(samples):>8.1f}")
+
+    print()
+    for name in ("ferry_core", "ferry", "ferry_gui"):
+        print(f"{name} saves {medians['eager'] - medians[name]:.1f} ms vs eager imports")
+
+if __name__ == "__main__":
+    main()
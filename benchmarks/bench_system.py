@@ -0,0 +1,186 @@
+"""Throughput, latency and memory of the main FerrySystem operations
+
+    python benchmarks/bench_system.py [--sizes 100 1000 10000 100000] [--output results.json]
+    python benchmarks/bench_system.py --sizes 1000 --compare results.json
+
+For every passenger count the script registers that many synthetic
+travelers, renders a sample of their tickets, pays all of them, and
+times get_all_travelers and the dashboard's row formatting. Each
+operation is timed call by call (p50/p99), then repeated under
+tracemalloc for its peak memory. Results are written as JSON so two runs
+can be compared with --compare.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_counters import DEPARTURES, SkipRenderExecutor
+from ferry_boarding import TicketSigner
+from ferry_core import DESTINATIONS, STATUSES, FerrySystem
+
+DASHBOARD_PAGE = 15  # rows VirtualTable formats for one screen
+
+def make_system(size, qr_folder):
+    system = FerrySystem(render_executor=SkipRenderExecutor(), qr_folder=qr_folder,
+                         signer=TicketSigner(key=b"bench"))
+    system.preview_sizes = ()
+    system.sailings.default_capacity = size
+    return system
+
+def booking(i):
+    return (f"Passenger {i}", STATUSES[i % len(STATUSES)], i % 3 == 0, DESTINATIONS[i % len(DESTINATIONS)],
+            i % 7 == 0, DEPARTURES[i % len(DEPARTURES)])
+
+def gui_app_class():
+    """FerryApp, or None when customtkinter is not installed"""
+    try:
+        from ferry_gui import FerryApp
+    except ImportError:
+        return None
+    return FerryApp
+
+def dashboard_formatter(system, app_class):
+    """FerryApp.dashboard_row bound to a stand-in app, so no Tk window is needed"""
+    app = SimpleNamespace(system=system)
+    app.format_time_12hr = lambda time_24: app_class.format_time_12hr(app, time_24)
+    return lambda traveler_id: app_class.dashboard_row(app, traveler_id)
+
+def operations(size, render_samples, qr_folder):
+    """(name, setup, call, count) for each benchmarked operation
+
+    setup() builds fresh state and returns the argument each call gets;
+    call(state, i) is timed once per i in range(count).
+    """
+    def registered():
+        system = make_system(size, qr_folder)
+        for i in range(size):
+            system.register_traveler(*booking(i))
+        return system
+
+    def register(system, i):
+        system.register_traveler(*booking(i))
+
+    def render(system, i):
+        t = system.travelers[i]
+        fn, *args = system._ticket_args(t)
+        fn(*args)
+
+    def pay(system, i):
+        system.mark_as_paid(system.travelers.ids[i])
+
+    def get_all(system, i):
+        system.get_all_travelers()
+
+    def dashboard(state, i):
+        system, format_row = state
+        keys = list(system.travelers.ids)
+        for traveler_id in keys[:DASHBOARD_PAGE]:
+            format_row(traveler_id)
+
+    def dashboard_setup():
+        system = registered()
+        return system, dashboard_formatter(system, app_class)
+
+    repeats = max(3, min(50, 100000 // size))
+    ops = [
+        ("register_traveler", lambda: make_system(size, qr_folder), register, size),
+        ("render_ticket", registered, render, min(size, render_samples)),
+        ("mark_as_paid", registered, pay, size),
+        ("get_all_travelers", registered, get_all, repeats),
+    ]
+    app_class = gui_app_class()
+    if app_class is not None:
+        ops.append(("dashboard_refresh", dashboard_setup, dashboard, repeats))
+    return ops
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+def measure(setup, call, count):
+    state = setup()
+    samples = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for i in range(count):
+        t0 = clock()
+        call(state, i)
+        samples.append(clock() - t0)
+    elapsed = (clock() - start) / 1e9
+    samples.sort()
+
+    # Same work again under tracemalloc, which is too slow to time with
+    state = setup()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        call(state, i)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    return {
+        "count": count,
+        "seconds": round(elapsed, 6),
+        "ops_per_second": round(count / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(samples, 0.50) / 1e6, 4),
+        "p99_ms": round(percentile(samples, 0.99) / 1e6, 4),
+        "mean_ms": round(statistics.fmean(samples) / 1e6, 4),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["operation"], r["passengers"]): r for r in json.load(f)["results"]}
+    print()
+    print(f"{'operation':<20} {'passengers':>10} {'ops/s':>10} {'p99':>8}  vs {os.path.basename(baseline_path)}")
+    for r in results:
+        old = baseline.get((r["operation"], r["passengers"]))
+        if old is None or not old["ops_per_second"]:
+            continue
+        print(f"{r['operation']:<20} {r['passengers']:>10} {r['ops_per_second'] / old['ops_per_second']:>9.2f}x "
+              f"{r['p99_ms'] / old['p99_ms'] if old['p99_ms'] else float('nan'):>7.2f}x")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--render-samples", type=int, default=100, help="tickets rendered per size")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'operation':<20} {'passengers':>10} {'ops/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'peak KiB':>10}")
+    with tempfile.TemporaryDirectory() as qr_folder:
+        for size in args.sizes:
+            for name, setup, call, count in operations(size, args.render_samples, qr_folder):
+                result = dict(operation=name, passengers=size, **measure(setup, call, count))
+                results.append(result)
+                print(f"{name:<20} {size:>10} {result['ops_per_second']:>10.0f} {result['p50_ms']:>8.3f} "
+                      f"{result['p99_ms']:>8.3f} {result['peak_memory_kb']:>10.0f}")
+
+    if args.output:
+        report = {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Ticket image storage: sharded folders, compact files, a read cache and retention
+
+    python ferry_assets.py --db ferry_system.db --max-age-days 30
+    python ferry_assets.py --journal ticket_logs.jsonl --dry-run
+
+Tickets live in <root>/<traveler_id // shard_size>/, so no folder grows
+past shard_size files. Any ticket can be redrawn from the traveler table,
+which is what makes deleting old files (compaction) safe.
+"""
+import argparse
+import datetime
+import os
+import sys
+import threading
+from collections import OrderedDict
+from ferry_metrics import METRICS
+from ferry_table import ticket_basename
+
+# Constants
+SHARD_SIZE = 1000
+CACHE_SIZE = 256  # encoded tickets kept in memory (1-bit PNGs are ~6 KB)
+PREVIEW_CACHE_BYTES = 64 << 20  # ~128 tickets at the two GUI preview sizes
+TICKET_FORMATS = ("png", "webp")
+
+class TicketAssets:
+    """Where ticket files go, how they are read back, and when they are deleted
+
+    With eager=False nothing is drawn at registration; FerrySystem renders a
+    ticket the first time someone asks for it (ensure_ticket).
+    """
+    def __init__(self, root, image_format="png", shard_size=SHARD_SIZE, eager=True, cache_size=CACHE_SIZE):
+        if image_format not in TICKET_FORMATS:
+            raise ValueError(f"image_format must be one of {TICKET_FORMATS}, not {image_format!r}")
+        self.root = root
+        self.image_format = image_format
+        self.shard_size = shard_size
+        self.eager = eager
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # path -> encoded file contents
+        self._lock = threading.Lock()
+
+    @property
+    def extension(self):
+        return "." + self.image_format
+
+    def folder_for(self, traveler_id):
+        return os.path.join(self.root, f"{traveler_id // self.shard_size:04d}")
+
+    def path_for(self, traveler_id):
+        return os.path.join(self.folder_for(traveler_id), ticket_basename(traveler_id, self.extension))
+
+    def read(self, path):
+        """Encoded ticket file contents, from the cache when possible; None if not on disk"""
+        with self._lock:
+            data = self._cache.get(path)
+            if data is not None:
+                self._cache.move_to_end(path)
+                METRICS.count("ticket_cache.hit")
+                return data
+        METRICS.count("ticket_cache.miss")
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._cache[path] = data
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+
+    def forget(self, path):
+        """Drop a cached copy, e.g. after the file was redrawn"""
+        with self._lock:
+            self._cache.pop(path, None)
+
+    def discard(self, path):
+        """Delete a ticket file (and its cached copy); returns the bytes freed"""
+        self.forget(path)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return 0
+        return size
+
+    @staticmethod
+    def _is_ticket(name, extension):
+        digits = name[len("traveler_"):-len("_ticket" + extension)]
+        return digits.isdigit() and name == ticket_basename(int(digits), extension)
+
+    def compact(self, system, max_age_days=None, dry_run=False):
+        """Delete ticket files that are no longer needed
+
+        Removed: files of boarded travelers, files issued more than
+        max_age_days ago, and files that belong to no known traveler.
+        Empty shard folders are removed too. Returns (files, bytes).
+        """
+        cutoff = None
+        if max_age_days is not None:
+            cutoff = (datetime.datetime.now() - datetime.timedelta(days=max_age_days)).strftime('%Y-%m-%d %H:%M:%S')
+
+        keep = set()
+        for t in system.travelers:
+            if t.is_boarded or (cutoff is not None and t.issued_at is not None and t.issued_at < cutoff):
+                continue
+            keep.add(os.path.normpath(t.qr_filename))
+
+        # Only finished ticket files: never a save_ticket .tmp still being written, nor anything else
+        extension = system.travelers.ticket_ext
+        files = freed = 0
+        for folder, _, names in os.walk(self.root, topdown=False):
+            for name in names:
+                path = os.path.join(folder, name)
+                if not self._is_ticket(name, extension) or os.path.normpath(path) in keep:
+                    continue
+                files += 1
+                freed += os.path.getsize(path) if dry_run else self.discard(path)
+            if folder != self.root and not dry_run and not os.listdir(folder):
+                os.rmdir(folder)
+        return files, freed
+
+class PreviewCache:
+    """Downscaled ticket images keyed by (traveler_id, ticket_version)
+
+    Bounded by pixel bytes and evicted least recently used first. A
+    reissued ticket gets a new version, so stale previews are never
+    returned; they just age out.
+    """
+    def __init__(self, max_bytes=PREVIEW_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries = OrderedDict()  # key -> {(width, height): image}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, size):
+        with self._lock:
+            previews = self._entries.get(key)
+            if previews is None or size not in previews:
+                return None
+            self._entries.move_to_end(key)
+            return previews[size]
+
+    def put(self, key, previews):
+        """Add {(width, height): image} previews for one ticket version"""
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            self._entries.move_to_end(key)
+            for size, image in previews.items():
+                old = entry.get(size)
+                if old is not None:
+                    self.size_bytes -= old.width * old.height
+                entry[size] = image
+                self.size_bytes += image.width * image.height
+            while self.size_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= sum(image.width * image.height for image in evicted.values())
+
+def main(argv=None):
+    from ferry_core import QR_FOLDER, open_system
+
+    parser = argparse.ArgumentParser(description="Delete ticket images that are no longer needed")
+    parser.add_argument("--db", help="SQLite database the travelers are stored in")
+    parser.add_argument("--journal", help="ticket_logs journal file the travelers are stored in")
+    parser.add_argument("--qr-folder", default=QR_FOLDER, help="where ticket images are written")
+    parser.add_argument("--max-age-days", type=float, help="also delete tickets issued longer ago than this")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be deleted")
+    args = parser.parse_args(argv)
+    if not args.db and not args.journal:
+        parser.error("--db or --journal is needed to know which tickets are still live")
+
+    system = open_system(args.db, args.journal, qr_folder=args.qr_folder)
+    if system.journal is not None and not system.journal.is_complete():
+        # Travelers only the lost snapshot knew about would look like orphans
+        system.shutdown()
+        print(f"error: {args.journal} has no snapshot ({system.journal.snapshot_path}) and does not start "
+              f"at its first event; refusing to delete tickets", file=sys.stderr)
+        return 2
+    try:
+        files, freed = system.assets.compact(system, args.max_age_days, args.dry_run)
+    finally:
+        system.shutdown()
+    print(f"{'Would delete' if args.dry_run else 'Deleted'} {files} ticket images ({freed / 1024:.0f} KiB)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Headless bulk registration for group bookings and tour operators
+
+    python ferry_batch.py bookings.csv --db ferry_system.db
+    python ferry_batch.py bookings.jsonl --departure 08:30 --workers 8
+
+Each record needs name, status, is_local and destination; is_pwd and
+departure_time are optional. Tickets are rendered across all cores.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent import futures
+from concurrent.futures import ProcessPoolExecutor
+from ferry_core import DESTINATIONS, QR_FOLDER, STATUSES, FerrySystem, SailingFull, open_system
+
+TRUE_VALUES = ("1", "y", "yes", "true")
+FALSE_VALUES = ("", "0", "n", "no", "false")
+
+BatchReport = namedtuple("BatchReport", ["traveler_ids", "failures", "rejected", "register_seconds", "total_seconds"])
+
+def parse_flag(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"expected yes/no, got {value!r}")
+
+def _match(value, choices, field):
+    for choice in choices:
+        if choice.lower() == str(value).strip().lower():
+            return choice
+    raise ValueError(f"{field} must be one of {', '.join(choices)}, got {value!r}")
+
+def clean_booking(row, line_no):
+    """Validate one raw record into register_traveler keyword arguments
+
+    departure_time comes back as HH:MM, or None when the record has none.
+    """
+    try:
+        name = str(row["name"]).strip()
+        if not name:
+            raise ValueError("name is empty")
+        return {
+            "name": name,
+            "status": _match(row["status"], STATUSES, "status"),
+            "is_local": parse_flag(row["is_local"]),
+            "destination": _match(row["destination"], DESTINATIONS, "destination"),
+            "is_pwd": parse_flag(row.get("is_pwd") or False),
+            "departure_time": FerrySystem.normalize_departure(row.get("departure_time")),
+        }
+    except KeyError as e:
+        raise ValueError(f"record {line_no}: missing field {e}") from None
+    except ValueError as e:
+        raise ValueError(f"record {line_no}: {e}") from None
+
+def read_bookings(path, fmt=None):
+    """Yield validated bookings from a CSV (with header) or JSON Lines file"""
+    if fmt is None:
+        fmt = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for line_no, row in enumerate(rows, start=1):
+            yield clean_booking(row, line_no)
+
+def register_batch(system, bookings, departure_time=None):
+    """Register every booking, then wait for all of their tickets to render
+
+    Bookings for a sailing with no seats left are skipped and reported in
+    BatchReport.rejected as (booking, reason) pairs.
+    """
+    start = time.perf_counter()
+    traveler_ids = []
+    rejected = []
+    for booking in bookings:
+        if booking.get("departure_time") is None:
+            booking = dict(booking, departure_time=departure_time)
+        try:
+            traveler_id, _ = system.register_traveler(**booking)
+        except SailingFull as e:
+            rejected.append((booking, str(e)))
+            continue
+        traveler_ids.append(traveler_id)
+    registered = time.perf_counter()
+
+    # Finished jobs are dropped by FerrySystem, so only pending or failed ones are left
+    jobs = {tid: system.get_render_job(tid) for tid in traveler_ids}
+    jobs = {tid: job for tid, job in jobs.items() if job is not None}
+    futures.wait(jobs.values())
+    failures = {tid: job.exception() for tid, job in jobs.items() if job.exception() is not None}
+    return BatchReport(traveler_ids, failures, rejected, registered - start, time.perf_counter() - start)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-register ferry travelers and render their tickets")
+    parser.add_argument("input", help="CSV or JSON Lines file of bookings")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="input format (default: from extension)")
+    parser.add_argument("--db", help="SQLite database to persist travelers in")
+    parser.add_argument("--journal", help="ticket_logs journal file to append to")
+    parser.add_argument("--qr-folder", default=QR_FOLDER, help="where ticket images are written")
+    parser.add_argument("--departure", help="departure time (HH:MM) for bookings without one")
+    parser.add_argument("--seats", type=int, help="capacity of each --departure sailing")
+    parser.add_argument("--summer", action="store_true",
+                        help="switch to summer fares, repricing unpaid tickets (without it the saved season is kept)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="render processes (default: all cores)")
+    args = parser.parse_args(argv)
+    try:
+        args.departure = FerrySystem.normalize_departure(args.departure)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        bookings = list(read_bookings(args.input, args.format))
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    system = open_system(args.db, args.journal, render_executor=ProcessPoolExecutor(max_workers=args.workers),
+                         qr_folder=args.qr_folder)
+    system.preview_sizes = ()  # no GUI previews, and nothing extra to ship back from worker processes
+    if args.summer:
+        system.set_summer(True)
+    if args.seats is not None and args.departure:
+        for destination in DESTINATIONS:
+            system.set_capacity(destination, args.departure, args.seats)
+    try:
+        report = register_batch(system, bookings, args.departure)
+    finally:
+        system.shutdown()
+
+    count = len(report.traveler_ids)
+    print(f"Registered {count} travelers in {report.register_seconds:.2f} s "
+          f"({count / max(report.register_seconds, 1e-9):.0f}/s)")
+    print(f"Rendered {count - len(report.failures)} tickets in {report.total_seconds:.2f} s "
+          f"({count / max(report.total_seconds, 1e-9):.1f}/s) with {args.workers} workers")
+    for booking, reason in report.rejected:
+        print(f"error: {booking['name']} not booked: {reason}", file=sys.stderr)
+    for traveler_id, error in sorted(report.failures.items()):
+        print(f"error: ticket for traveler {traveler_id} failed: {error}", file=sys.stderr)
+    return 1 if report.failures or report.rejected else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from collections import namedtuple
+
+# Constants
+KEY_FILE = "ferry_ticket.key"
+KEY_ENV = "FERRY_TICKET_KEY"  # hex-encoded key; overrides KEY_FILE
+PAYLOAD_PREFIX = "MFT1"
+SIGNATURE_BYTES = 10
+
+# Scan outcomes
+ACCEPTED = "accepted"
+INVALID = "invalid"
+UNKNOWN = "unknown"
+SUPERSEDED = "superseded"
+UNPAID = "unpaid"
+ALREADY_BOARDED = "already_boarded"
+
+ScanResult = namedtuple("ScanResult", ["status", "traveler_id", "message"])
+
+class InvalidTicket(ValueError):
+    pass
+
+def load_ticket_key(path=KEY_FILE):
+    """Read the signing key from the environment or key file, creating the file on first use"""
+    if os.environ.get(KEY_ENV):
+        return bytes.fromhex(os.environ[KEY_ENV])
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        key = os.urandom(32)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
+
+class TicketSigner:
+    """Compact signed QR payloads: MFT1:<id>:<version>:<base32 HMAC>
+
+    Everything is upper-case so the QR encoder can use alphanumeric mode,
+    which keeps tickets at a small QR version.
+    """
+    def __init__(self, key=None):
+        self._key = key
+
+    @property
+    def key(self):
+        if self._key is None:
+            self._key = load_ticket_key()
+        return self._key
+
+    def _signature(self, traveler_id, version):
+        message = f"{PAYLOAD_PREFIX}:{traveler_id}:{version}".encode()
+        digest = hmac.new(self.key, message, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+        return base64.b32encode(digest).decode().rstrip("=")
+
+    def sign(self, traveler_id, version):
+        return f"{PAYLOAD_PREFIX}:{traveler_id}:{version}:{self._signature(traveler_id, version)}"
+
+    def verify(self, payload):
+        """Return (traveler_id, version) or raise InvalidTicket"""
+        try:
+            prefix, traveler_id, version, signature = payload.strip().split(":")
+            traveler_id, version = int(traveler_id), int(version)
+        except ValueError:
+            raise InvalidTicket("not a ferry ticket") from None
+        if prefix != PAYLOAD_PREFIX:
+            raise InvalidTicket(f"unsupported ticket format {prefix!r}")
+        if not hmac.compare_digest(signature, self._signature(traveler_id, version)):
+            raise InvalidTicket("signature mismatch")
+        return traveler_id, version
+
+class BoardingValidator:
+    """Checks gangway scans against FerrySystem's in-memory traveler table
+
+    A scan is accepted once per traveler: the ticket must verify, be the
+    latest issued version and be paid. Boarding is recorded through
+    FerrySystem.mark_boarded, so it is journaled and survives restarts.
+    """
+    def __init__(self, system, signer=None):
+        self.system = system
+        self.signer = signer or system.signer
+        self.counts = {}
+        self._counts_lock = threading.Lock()
+
+    def validate(self, payload, board=True):
+        result = self._check(payload, board)
+        with self._counts_lock:
+            self.counts[result.status] = self.counts.get(result.status, 0) + 1
+        return result
+
+    def _check(self, payload, board):
+        try:
+            traveler_id, version = self.signer.verify(payload)
+        except InvalidTicket as e:
+            return ScanResult(INVALID, None, str(e))
+
+        t = self.system.get_traveler(traveler_id)
+        if t is None:
+            return ScanResult(UNKNOWN, traveler_id, "ticket was not issued here")
+        if version != t.ticket_version:
+            return ScanResult(SUPERSEDED, traveler_id, f"ticket v{version} was reissued as v{t.ticket_version}")
+        if not t.is_paid:
+            return ScanResult(UNPAID, traveler_id, "fare not paid")
+        if not board:
+            return ScanResult(ACCEPTED, traveler_id, "valid")
+        if not self.system.mark_boarded(traveler_id):
+            return ScanResult(ALREADY_BOARDED, traveler_id, "already boarded")
+        return ScanResult(ACCEPTED, traveler_id, f"welcome aboard, {t.name}")
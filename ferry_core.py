@@ -0,0 +1,656 @@
+import io
+import os
+import re
+import datetime
+import threading
+from collections import namedtuple
+from contextlib import ExitStack, contextmanager
+from ferry_assets import PreviewCache, TicketAssets
+from ferry_boarding import TicketSigner
+from ferry_fares import FARES
+from ferry_ids import IdAllocator
+from ferry_journal import TicketJournal
+from ferry_metrics import METRICS, timed
+from ferry_render import PREVIEW_SIZES, load_ticket, make_previews, open_ticket, render_ticket, stamp_preview
+from ferry_sailings import SailingFull, SailingSchedule
+from ferry_search import SEARCH_LIMIT, SearchIndex
+from ferry_storage import SQLiteStore, TicketStore
+from ferry_table import FLAG_PAID, Traveler, TravelerTable
+
+# Constants
+QR_FOLDER = "qr_codes"
+RENDER_WORKERS = min(4, os.cpu_count() or 1)
+ROW_LOCK_STRIPES = 64
+STATUSES = ("Infant", "Child", "Student", "Regular", "Senior")
+DESTINATIONS = ("Tingloy", "Mabini")
+DEPARTURE_PATTERN = re.compile(r"(\d{1,2}):(\d{2})", re.ASCII)
+
+def _chain_future(source, target):
+    """Copy the outcome of one Future into another"""
+    if source.cancelled():
+        target.cancel()
+        return
+    error = source.exception()
+    if error is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
+
+def _job_failed(job):
+    return job.done() and (job.cancelled() or job.exception() is not None)
+
+# Change events published by FerrySystem
+TRAVELER_ADDED = "traveler_added"
+PAID_CHANGED = "paid_changed"
+DEPARTURE_CHANGED = "departure_changed"
+FARE_CHANGED = "fare_changed"
+BOARDED = "boarded"
+
+ChangeEvent = namedtuple("ChangeEvent", ["kind", "traveler_id", "value"])
+
+class FerrySystem:
+    """Traveler registry, fares, sailings and tickets
+
+    Safe to share between ticket counters and worker threads: IDs come
+    from per-thread blocks, table writes serialize on the table lock,
+    changes to one traveler serialize on a striped row lock, and reads
+    go straight to the columns without locking.
+    """
+    def __init__(self, render_executor=None, store=None, journal=None, qr_folder=QR_FOLDER, signer=None,
+                 assets=None):
+        self.travelers = TravelerTable()
+        self.is_summer = False
+        self.ids = IdAllocator(start=101)
+        self._row_locks = [threading.Lock() for _ in range(ROW_LOCK_STRIPES)]
+        self.departure_time = None
+        self.qr_folder = qr_folder
+        os.makedirs(qr_folder, exist_ok=True)
+
+        # Sharded, compact ticket files with a read cache
+        self.assets = assets if assets is not None else TicketAssets(qr_folder)
+        self.travelers.ticket_ext = self.assets.extension
+
+        # Display-size copies made while rendering, so previews need no disk read or resample
+        self.previews = PreviewCache()
+        self.preview_sizes = PREVIEW_SIZES
+
+        # QR payloads are signed so the gangway can verify them offline
+        self.signer = signer if signer is not None else TicketSigner()
+
+        # Ticket images are rendered off the caller's thread
+        self._render_executor = render_executor
+        self.render_jobs = {}
+        self._render_lock = threading.Lock()
+
+        # Callbacks receiving a ChangeEvent after every state change
+        self.subscribers = []
+
+        # Seats and manifests per (destination, departure_time)
+        self.sailings = SailingSchedule()
+
+        # Name and ID search; indexes new rows on each search, however they were added
+        self.search_index = SearchIndex(self.travelers)
+
+        # Restore sailings, travelers and the ID counter from the store, then
+        # replay journal events the store may not have committed before a crash
+        self.store = store if store is not None else TicketStore()
+        self.is_summer = bool(self.store.load_settings().get("is_summer", False))
+        for row in self.store.load_sailings():
+            self.sailings.add_sailing(row["destination"], self._stored_departure(row["departure_time"]),
+                                      row["capacity"])
+        for row in self.store.load_travelers():
+            self.restore_traveler(row)
+        self.journal = journal
+        if journal is not None:
+            journal.replay(self)
+
+    @property
+    def render_executor(self):
+        # The default pool (and concurrent.futures) is only loaded by the first render
+        if self._render_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._render_executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS,
+                                                       thread_name_prefix="ticket-render")
+        return self._render_executor
+
+    @property
+    def next_id(self):
+        """Lowest ID no counter has reserved yet"""
+        return self.ids.next_free
+
+    @next_id.setter
+    def next_id(self, value):
+        self.ids.advance_past(value - 1)
+
+    def generate_unique_id(self):
+        return self.ids.next_id()
+
+    def _row_lock(self, traveler_id):
+        return self._row_locks[traveler_id % ROW_LOCK_STRIPES]
+
+    @staticmethod
+    def normalize_departure(departure_time):
+        """'8:30' or ' 08:30 ' -> '08:30', empty -> None; ValueError unless it is a 24-hour HH:MM
+
+        Sailings are keyed by this form, so every path taking a departure
+        goes through here and "8:30" can never become a second sailing.
+        """
+        if departure_time is None:
+            return None
+        text = str(departure_time).strip()
+        if not text:
+            return None
+        match = DEPARTURE_PATTERN.fullmatch(text)
+        if match is None or int(match[1]) > 23 or int(match[2]) > 59:
+            raise ValueError(f"departure time must be HH:MM (24-hour), not {departure_time!r}")
+        return f"{int(match[1]):02d}:{match[2]}"
+
+    def _stored_departure(self, departure_time):
+        # Rows saved before departures were normalized may say "8:30"; anything unreadable is kept as is
+        try:
+            return self.normalize_departure(departure_time)
+        except ValueError:
+            return departure_time
+
+    def restore_traveler(self, row):
+        """Insert or overwrite a traveler from a stored row without re-rendering"""
+        departure_time = row.get("departure_time")
+        if departure_time and len(departure_time) != 5:
+            row = dict(row, departure_time=self._stored_departure(departure_time))
+        t = self.travelers.get(row["traveler_id"])
+        if t is None:
+            old_key = None
+            t = self.travelers.append(row)
+        else:
+            old_key = self._sailing_key(t)
+            t = self.travelers.update(t.row, row)
+        self.sailings.restore(t.row, old_key, t.destination, t.departure_time)
+        self.ids.advance_past(t.traveler_id)
+        return t
+
+    def apply_log_entry(self, entry):
+        """Replay one journal event; replaying an already applied event is a no-op"""
+        if entry["action"] == "register":
+            t = self.restore_traveler(dict(entry["details"], traveler_id=entry["traveler_id"]))
+            self.store.save_traveler(t)
+        elif entry["action"] in ("pay", "reissue"):
+            t = self.travelers.get(entry["traveler_id"])
+            if t is not None:
+                if entry["action"] == "pay":
+                    t.is_paid = True
+                departure_time = self._stored_departure(entry["details"].get("departure_time", t.departure_time))
+                self.sailings.restore(t.row, self._sailing_key(t), t.destination, departure_time)
+                t.departure_time = departure_time
+                t.ticket_version = entry["details"].get("ticket_version", t.ticket_version)
+                self.store.save_traveler(t)
+        elif entry["action"] == "season":
+            self.is_summer = entry["details"]["is_summer"]
+            self.store.save_setting("is_summer", self.is_summer)
+        elif entry["action"] == "capacity":
+            details = entry["details"]
+            self.restore_sailing(details["destination"], self._stored_departure(details["departure_time"]),
+                                 details["capacity"])
+        elif entry["action"] == "reprice":
+            self.is_summer = entry["details"]["is_summer"]
+            t = self.travelers.get(entry["traveler_id"])
+            if t is not None:
+                t.fare = entry["details"]["fare"]
+                self.store.save_traveler(t)
+        elif entry["action"] == "board":
+            t = self.travelers.get(entry["traveler_id"])
+            if t is not None and self.travelers.set_boarded(t.row):
+                self.store.mark_boarded(t.traveler_id)
+
+    def subscribe(self, callback):
+        """Call callback(ChangeEvent) after every change; returns callback for unsubscribe"""
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def _publish(self, kind, traveler_id, value=None):
+        event = ChangeEvent(kind, traveler_id, value)
+        for callback in list(self.subscribers):
+            callback(event)
+
+    def _sailing_key(self, t):
+        return (t.destination, t.departure_time) if t.departure_time else None
+
+    def get_sailing(self, destination, departure_time):
+        """Return the Sailing for this destination and departure, or None"""
+        return self.sailings.get(destination, self.normalize_departure(departure_time))
+
+    def set_capacity(self, destination, departure_time, capacity):
+        """Set how many seats a sailing has; existing bookings are never dropped"""
+        departure_time = self.normalize_departure(departure_time)
+        if departure_time is None:
+            raise ValueError("a sailing needs a departure time")
+        sailing = self.restore_sailing(destination, departure_time, int(capacity))
+        self._log_many([(None, "capacity", {"destination": destination, "departure_time": departure_time,
+                                            "capacity": sailing.capacity})])
+        return sailing
+
+    def restore_sailing(self, destination, departure_time, capacity):
+        """Set a sailing's capacity as saved or journaled, without logging it again"""
+        sailing = self.sailings.add_sailing(destination, departure_time, capacity)
+        self.store.save_sailing(sailing)
+        return sailing
+
+    def get_manifest(self, destination, departure_time):
+        """Travelers booked on a sailing, in booking order"""
+        sailing = self.get_sailing(destination, departure_time)
+        if sailing is None:
+            return []
+        table = self.travelers
+        return [table[row] for row in sailing.rows]
+
+    def set_departure_time(self, departure_time):
+        """Set the departure used for new tickets; traveler_id is None in the event"""
+        departure_time = self.normalize_departure(departure_time)
+        self.departure_time = departure_time
+        self._publish(DEPARTURE_CHANGED, None, departure_time)
+
+    def _log(self, t, action, details):
+        if self.journal is None:
+            return
+        self.journal.append(t.traveler_id, action, details)
+        if self.journal.needs_snapshot():
+            self.journal.request_snapshot(self)
+
+    def _log_many(self, events):
+        """Journal (traveler_id, action, details) events as one group"""
+        if self.journal is None or not events:
+            return
+        self.journal.append_many(events)
+        if self.journal.needs_snapshot():
+            self.journal.request_snapshot(self)
+
+    def get_traveler(self, traveler_id):
+        """Return the Traveler with this ID, or None"""
+        try:
+            return self.travelers.get(int(traveler_id))
+        except (TypeError, ValueError):
+            return None
+
+    def query(self, destination=None, status=None, is_paid=None):
+        """Iterate travelers matching every given filter, in registration order"""
+        return self.travelers.find(destination, status, is_paid)
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Travelers whose name or ID best matches what was typed so far, best first"""
+        return self.search_index.search(query, limit)
+
+    def calculate_fare_by_status(self, status):
+        return FARES.base_fare(status, self.is_summer)
+
+    @timed("set_summer")
+    def set_summer(self, is_summer):
+        """Switch the season and reprice every unpaid ticket in one pass over the columns
+
+        Returns the number of travelers whose fare changed.
+        """
+        table = self.travelers
+        changed = []
+        # Holding the table lock keeps payments from landing between the unpaid scan and the writes
+        with table.lock:
+            self.is_summer = bool(is_summer)
+            unpaid = [row for row, flags in enumerate(table.flags) if not flags & FLAG_PAID]
+            fares = FARES.price_columns(table.status_codes, table.flags, table.statuses.values,
+                                        self.is_summer, unpaid)
+            for row, fare in zip(unpaid, fares):
+                if table.fares[row] != fare:
+                    table.set_fare(row, fare)
+                    changed.append((table[row], fare))
+
+        # The season is recorded on its own, so it survives a restart even when no fare changed
+        with self.store.transaction():
+            self.store.save_setting("is_summer", self.is_summer)
+            for t, fare in changed:
+                self.store.update_fare(t.traveler_id, fare)
+        self._log_many([(None, "season", {"is_summer": self.is_summer})] +
+                       [(t.traveler_id, "reprice", {"fare": fare, "is_summer": self.is_summer})
+                        for t, fare in changed])
+        for t, fare in changed:
+            self._publish(FARE_CHANGED, t.traveler_id, fare)
+        return len(changed)
+
+    @timed("register_traveler")
+    def register_traveler(self, name, status, is_local, destination, is_pwd=False, departure_time=None):
+        """Book a seat and issue a ticket; raises SailingFull when the sailing has no seat left
+
+        A departure_time that is not HH:MM raises ValueError before anything is booked.
+        """
+        departure_time = self.normalize_departure(departure_time)
+        traveler_id = self.generate_unique_id()
+        base_fare, env_fee, total_fare = FARES.price(status, is_local, is_pwd, self.is_summer)
+        qr_filename = self.assets.path_for(traveler_id)
+        
+        issued_at = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        fields = {
+            "traveler_id": traveler_id,
+            "name": name,
+            "status": status,
+            "is_local": is_local,
+            "destination": destination,
+            "fare": total_fare,
+            "qr_filename": qr_filename,
+            "is_pwd": is_pwd,
+            "departure_time": departure_time,
+            "issued_at": issued_at
+        }
+        with self.travelers.lock:
+            # The seat is booked for the row the traveler is about to occupy
+            if departure_time:
+                self.sailings.reserve(destination, departure_time, len(self.travelers))
+            traveler = self.travelers.append(fields)
+        self.store.save_traveler(traveler)
+        details = traveler.to_dict()
+        del details["traveler_id"]
+        self._log(traveler, "register", details)
+        self._publish(TRAVELER_ADDED, traveler_id, traveler)
+        
+        self.generate_qr_code(traveler, base_fare, env_fee, total_fare)
+        
+        return traveler.traveler_id, traveler.qr_filename
+
+    @timed("generate_qr_code")
+    def generate_qr_code(self, t, base, env, total, departure_time=None):
+        """Queue the ticket image for rendering and return its Future
+
+        The QR only carries the signed ID and ticket version; name, sailing
+        and fare are printed under it for people, and payment state is
+        overlaid by open_ticket, so paying never re-renders. With lazy
+        assets the stale file is only deleted and None is returned;
+        ensure_ticket draws it when it is first needed.
+        """
+        if not self.assets.eager:
+            self.assets.discard(t.qr_filename)
+            return None
+        return self._submit_render(t.traveler_id, t.qr_filename, *self._ticket_args(t, total, departure_time))
+
+    def _ticket_args(self, t, total=None, departure_time=None):
+        """render_ticket and its arguments for the traveler's current ticket"""
+        qr_data, details = self.ticket_content(t, total, departure_time)
+        return render_ticket, qr_data, t.traveler_id, t.qr_filename, details, self.preview_sizes
+
+    def ticket_content(self, t, total=None, departure_time=None):
+        """(signed QR payload, printed detail lines) of the traveler's current ticket"""
+        if total is None:
+            total = t.fare
+        if departure_time is None:
+            departure_time = t.departure_time
+
+        if departure_time:
+            try:
+                hour, minute = map(int, departure_time.split(':'))
+                ampm = 'PM' if hour >= 12 else 'AM'
+                hour12 = hour % 12 or 12
+                departure_display = f"{hour12}:{minute:02d} {ampm}"
+            except ValueError:
+                departure_display = "Not Set"
+        else:
+            departure_display = "Not Set"
+
+        qr_data = self.signer.sign(t.traveler_id, t.ticket_version)
+        details = (
+            t.name,
+            f"{t.destination.title()} - {departure_display}",
+            f"{t.status.title()}{' (PWD)' if t.is_pwd else ''} - PHP {int(total)}.00",
+        )
+        return qr_data, details
+
+    def ensure_ticket(self, traveler_id):
+        """Make sure the ticket file exists; returns the pending render Future, or None if it is on disk
+
+        A missing file whose last render failed is drawn again.
+        """
+        t = self.get_traveler(traveler_id)
+        if t is None:
+            return None
+        with self._row_lock(t.traveler_id):
+            job = self.render_jobs.get(t.traveler_id)
+            if os.path.exists(t.qr_filename) or (job is not None and not _job_failed(job)):
+                return job
+            return self._submit_render(t.traveler_id, t.qr_filename, *self._ticket_args(t))
+
+    @timed("open_ticket")
+    def open_ticket(self, traveler_id):
+        """The traveler's ticket image with its payment stamp; the file must exist (see ensure_ticket)"""
+        t = self.get_traveler(traveler_id)
+        data = self.assets.read(t.qr_filename)
+        if data is None:
+            raise FileNotFoundError(t.qr_filename)
+        return open_ticket(io.BytesIO(data), t.is_paid)
+
+    @timed("open_preview")
+    def open_preview(self, traveler_id, size):
+        """The ticket scaled to size with its payment stamp, from the preview cache when possible"""
+        t = self.get_traveler(traveler_id)
+        key = (t.traveler_id, t.ticket_version)
+        preview = self.previews.get(key, size)
+        METRICS.count("previews.miss" if preview is None else "previews.hit")
+        if preview is None:
+            data = self.assets.read(t.qr_filename)
+            if data is None:
+                raise FileNotFoundError(t.qr_filename)
+            previews = make_previews(load_ticket(io.BytesIO(data)), (size,))
+            self.previews.put(key, previews)
+            preview = previews[size]
+        return stamp_preview(preview, t.is_paid)
+
+    def _submit_render(self, traveler_id, qr_filename, fn, *args):
+        # Jobs for the same ticket write the same file, so run them in order
+        with self._render_lock:
+            prev = self.render_jobs.get(traveler_id)
+            if prev is None or prev.done():
+                job = self.render_executor.submit(fn, *args)
+            else:
+                from concurrent.futures import Future
+                job = Future()
+
+                def start(_):
+                    try:
+                        inner = self.render_executor.submit(fn, *args)
+                    except RuntimeError as e:
+                        job.set_exception(e)
+                        return
+                    inner.add_done_callback(lambda f: _chain_future(f, job))
+
+                prev.add_done_callback(start)
+            self.render_jobs[traveler_id] = job
+        METRICS.count("renders.submitted")
+        # The file is being redrawn, so any cached copy is stale
+        self.assets.forget(qr_filename)
+        job.add_done_callback(lambda f: self.assets.forget(qr_filename))
+        key = (traveler_id, self.travelers.get(traveler_id).ticket_version)
+        job.add_done_callback(lambda f: self._keep_previews(key, f))
+        job.add_done_callback(lambda f: self._forget_render(traveler_id, f))
+        return job
+
+    def _keep_previews(self, key, job):
+        if not job.cancelled() and job.exception() is None and job.result():
+            self.previews.put(key, job.result())
+
+    def _forget_render(self, traveler_id, job):
+        # Only failed jobs are kept around, so they can still be reported
+        if _job_failed(job):
+            METRICS.count("renders.failed")
+            return
+        with self._render_lock:
+            if self.render_jobs.get(traveler_id) is job:
+                del self.render_jobs[traveler_id]
+
+    def get_render_job(self, traveler_id):
+        """Return the latest render Future for a traveler, or None"""
+        return self.render_jobs.get(traveler_id)
+
+    def wait_for_ticket(self, traveler_id, timeout=None):
+        """Block until the traveler's ticket is written; re-raises render errors"""
+        job = self.ensure_ticket(traveler_id)
+        if job is not None:
+            job.result(timeout)
+        return self.get_traveler(traveler_id).qr_filename
+
+    def shutdown(self, wait=True):
+        if self._render_executor is not None:
+            if wait:
+                # Chained jobs are only submitted once their predecessor finishes
+                from concurrent import futures
+                futures.wait(list(self.render_jobs.values()))
+            self._render_executor.shutdown(wait=wait)
+        if self.journal is not None:
+            self.journal.close()
+        self.store.close()
+
+    def get_all_travelers(self):
+        return [t.to_dict() for t in self.travelers]
+
+    @timed("mark_as_paid")
+    def mark_as_paid(self, traveler_id, departure_time=None):
+        departure_time = self.normalize_departure(departure_time)
+        t = self.get_traveler(traveler_id)
+        if t is None:
+            return False
+        with self._row_lock(t.traveler_id):
+            self._mark_as_paid(t, departure_time)
+        return True
+
+    def _mark_as_paid(self, t, departure_time):
+
+        if departure_time and departure_time != t.departure_time:
+            # Rebook first: a full sailing raises SailingFull and leaves the ticket as it was
+            old_key = self._sailing_key(t)
+            if old_key is None:
+                self.sailings.reserve(t.destination, departure_time, t.row)
+            else:
+                self.sailings.move(t.row, old_key, t.destination, departure_time)
+
+            details = self._apply_payment(t, departure_time)
+            self._publish(DEPARTURE_CHANGED, t.traveler_id, departure_time)
+            self._reissue(t)
+        else:
+            details = self._apply_payment(t)
+        self._log(t, "pay", details)
+        self._publish(PAID_CHANGED, t.traveler_id, True)
+
+    def _apply_payment(self, t, departure_time=None):
+        """Mark t paid, moving it to an already booked departure_time; returns the "pay" log details"""
+        t.is_paid = True
+        if departure_time:
+            # The sailing changed since issue, so the QR payload must be reissued
+            t.departure_time = departure_time
+            t.ticket_version += 1
+            self.store.save_traveler(t)
+        else:
+            self.store.update_paid(t.traveler_id, True)
+        return {"fare": t.fare, "departure_time": t.departure_time, "ticket_version": t.ticket_version}
+
+    def _reissue(self, t):
+        base_fare, env_fee, _ = FARES.price(t.status, t.is_local, t.is_pwd, self.is_summer)
+        return self.generate_qr_code(t, base_fare, env_fee, t.fare)
+
+    # Bulk operations: each validates everything first, then writes the
+    # store and the journal as one group; reissued tickets render in
+    # parallel on the render pool
+
+    def _bulk_travelers(self, traveler_ids):
+        """Travelers for the given IDs, without duplicates; KeyError names the first unknown ID"""
+        travelers = {}
+        for traveler_id in traveler_ids:
+            t = self.get_traveler(traveler_id)
+            if t is None:
+                raise KeyError(f"traveler {traveler_id} not found")
+            travelers.setdefault(t.traveler_id, t)
+        return list(travelers.values())
+
+    @contextmanager
+    def _locked_rows(self, travelers):
+        # Stripes are taken in index order, so two bulk calls can never deadlock
+        with ExitStack() as stack:
+            for stripe in sorted({t.traveler_id % ROW_LOCK_STRIPES for t in travelers}):
+                stack.enter_context(self._row_locks[stripe])
+            yield
+
+    def _move_all(self, travelers, departure_time):
+        """Rebook every traveler not already on departure_time; returns the ones moved"""
+        moved = [t for t in travelers if departure_time and departure_time != t.departure_time]
+        self.sailings.move_many([(t.row, self._sailing_key(t), t.destination, departure_time) for t in moved])
+        return moved
+
+    @timed("mark_many_paid")
+    def mark_many_paid(self, traveler_ids, departure_time=None):
+        """Pay for a whole group at once; returns the number of travelers changed
+
+        Unknown IDs raise KeyError and a sailing without enough seats for
+        the group raises SailingFull, both before anything is changed, as
+        does a departure_time that is not HH:MM (ValueError).
+        """
+        departure_time = self.normalize_departure(departure_time)
+        travelers = self._bulk_travelers(traveler_ids)
+        with self._locked_rows(travelers):
+            moved = set(self._move_all(travelers, departure_time))
+            changed = [t for t in travelers if t in moved or not t.is_paid]
+            with self.store.transaction():
+                events = [(t.traveler_id, "pay", self._apply_payment(t, departure_time if t in moved else None))
+                          for t in changed]
+            self._log_many(events)
+            for t in changed:
+                if t in moved:
+                    self._publish(DEPARTURE_CHANGED, t.traveler_id, departure_time)
+                    self._reissue(t)
+                self._publish(PAID_CHANGED, t.traveler_id, True)
+        return len(changed)
+
+    @timed("reissue_tickets")
+    def reissue_tickets(self, traveler_ids, departure_time=None):
+        """Issue new tickets for a group, optionally moving it to departure_time
+
+        The ticket version goes up, so the old QR codes stop scanning.
+        Returns the render Futures (None each with lazy assets). Raises
+        KeyError, SailingFull or ValueError like mark_many_paid.
+        """
+        departure_time = self.normalize_departure(departure_time)
+        travelers = self._bulk_travelers(traveler_ids)
+        with self._locked_rows(travelers):
+            moved = set(self._move_all(travelers, departure_time))
+            with self.store.transaction():
+                for t in travelers:
+                    if t in moved:
+                        t.departure_time = departure_time
+                    t.ticket_version += 1
+                    self.store.save_traveler(t)
+            self._log_many([(t.traveler_id, "reissue", {"departure_time": t.departure_time,
+                                                         "ticket_version": t.ticket_version})
+                            for t in travelers])
+            jobs = []
+            for t in travelers:
+                if t in moved:
+                    self._publish(DEPARTURE_CHANGED, t.traveler_id, departure_time)
+                jobs.append(self._reissue(t))
+        return jobs
+
+    @timed("mark_boarded")
+    def mark_boarded(self, traveler_id):
+        """Record a boarding; False if the traveler is unknown or already aboard"""
+        t = self.get_traveler(traveler_id)
+        if t is None:
+            return False
+        if not self.travelers.set_boarded(t.row):
+            return False
+        self.store.mark_boarded(t.traveler_id)
+        self._log(t, "board", {})
+        self._publish(BOARDED, t.traveler_id, True)
+        return True
+
+def open_system(db_path=None, journal_path=None, **options):
+    """FerrySystem loaded from a SQLite database and/or a journal (with its snapshot)
+
+    The GUI and every command-line tool open their state this way, so they
+    all see the same travelers. options go to FerrySystem.
+    """
+    store = SQLiteStore(db_path) if db_path else None
+    journal = TicketJournal(journal_path, store=store) if journal_path else None
+    return FerrySystem(store=store, journal=journal, **options)
@@ -0,0 +1,62 @@
+from array import array
+
+# Fare rules
+BASE_FARES = {"senior": 104.00, "student": 116.00, "child": 72.00, "infant": 0.00}
+DEFAULT_FARE = 160.00  # regular, and any status not listed above
+SUMMER_DISCOUNT = 0.90
+PWD_DISCOUNT = 0.80
+ENVIRONMENTAL_FEE = 50.00  # charged to non-locals
+
+def reference_price(status, is_local, is_pwd, is_summer):
+    """The original step-by-step fare rules; FareTable precomputes exactly these values"""
+    base = BASE_FARES.get(status.lower(), DEFAULT_FARE)
+    if is_summer:
+        base *= SUMMER_DISCOUNT
+    if is_pwd:
+        base = base * PWD_DISCOUNT
+    env = 0.00 if is_local else ENVIRONMENTAL_FEE
+    return base, env, base + env
+
+class FareTable:
+    """(base, env, total) for every status x local x PWD x season, computed once
+
+    Lookup slots are numbered summer * 4 + pwd * 2 + local, which matches
+    the low FLAG_LOCAL/FLAG_PWD bits of TravelerTable.flags, so a column
+    of flags indexes straight into a row of the table.
+    """
+    def __init__(self):
+        self.prices = {}
+        for status in list(BASE_FARES) + [None]:
+            self.prices[status] = [
+                reference_price(status or "regular", bool(slot & 1), bool(slot & 2), bool(slot & 4))
+                for slot in range(8)
+            ]
+
+    def _row(self, status):
+        row = self.prices.get(status.lower())
+        return self.prices[None] if row is None else row
+
+    def price(self, status, is_local, is_pwd, is_summer):
+        return self._row(status)[(4 if is_summer else 0) | (2 if is_pwd else 0) | (1 if is_local else 0)]
+
+    def base_fare(self, status, is_summer):
+        """Status fare before PWD discount and environmental fee"""
+        return self.price(status, True, False, is_summer)[0]
+
+    def totals_for(self, status_values, is_summer):
+        """Flat lookup list: totals[status_code * 4 + (flags & 3)]"""
+        season = 4 if is_summer else 0
+        totals = []
+        for status in status_values:
+            row = self._row(status or "regular")
+            totals.extend(row[season + slot][2] for slot in range(4))
+        return totals
+
+    def price_columns(self, status_codes, flags, status_values, is_summer, rows=None):
+        """Total fares for whole columns at once (optionally only the given rows)"""
+        totals = self.totals_for(status_values, is_summer)
+        if rows is None:
+            return array('d', [totals[code * 4 + (flag & 3)] for code, flag in zip(status_codes, flags)])
+        return array('d', [totals[status_codes[row] * 4 + (flags[row] & 3)] for row in rows])
+
+FARES = FareTable()
@@ -0,0 +1,866 @@
+import customtkinter as ctk
+import threading
+from collections import OrderedDict
+from tkinter import filedialog, messagebox, Toplevel, ttk
+from ferry_core import DESTINATIONS, STATUSES, TRAVELER_ADDED, SailingFull, open_system
+from ferry_journal import JOURNAL_FILE
+from ferry_metrics import timed
+from ferry_print import write_pdf
+from ferry_reports import export_manifest
+from ferry_storage import DB_FILE
+
+PHOTO_CACHE_SIZE = 16  # Tk images kept for instant reopening
+SEARCH_DELAY_MS = 150  # pause in typing before the dashboard search runs
+SEARCH_MATCHES = 200  # dashboard rows shown for a search
+
+class EventCoalescer:
+    """Collect FerrySystem events and hand them to a view at most once per frame
+
+    Events may arrive from any thread; the handler always runs on the Tk
+    thread with the list of events received since the previous frame.
+    """
+    FRAME_MS = 33
+
+    def __init__(self, widget, system, handler):
+        self.widget = widget
+        # Ticks are scheduled on the toplevel so they never outlive their Tcl command
+        self.root = widget.winfo_toplevel()
+        self.system = system
+        self.handler = handler
+        self._pending = []
+        self._lock = threading.Lock()
+        system.subscribe(self.push)
+        self.root.after(self.FRAME_MS, self._tick)
+
+    def push(self, event):
+        with self._lock:
+            self._pending.append(event)
+
+    def _tick(self):
+        if not self.widget.winfo_exists():
+            self.system.unsubscribe(self.push)
+            return
+        with self._lock:
+            events, self._pending = self._pending, []
+        if events:
+            self.handler(events)
+        self.root.after(self.FRAME_MS, self._tick)
+
+    def close(self):
+        self.system.unsubscribe(self.push)
+
+class VirtualTable:
+    """Treeview that only materializes the rows currently in view
+
+    The model is an ordered list of row keys; row_source(key) builds a
+    row's values when it scrolls into view. insert_row, update_row and
+    remove_row apply single-row diffs without touching the other rows.
+    Several rows can be selected; the selection survives scrolling.
+    """
+    HEADING_HEIGHT = 25
+
+    def __init__(self, parent, columns, row_source, height=15):
+        self.row_source = row_source
+        self.keys = []
+        self.positions = {}
+        self.offset = 0
+        self.visible = height
+        self.selected = None  # the row clicked last
+        self.marked = set()  # every selected row, visible or not
+        self._iids = {}
+
+        self.tree = ttk.Treeview(parent, columns=columns, show="headings", height=height, selectmode="extended")
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self._on_scrollbar)
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+
+    def set_rows(self, keys):
+        self.keys = list(keys)
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+        if self.selected not in self.positions:
+            self.selected = None
+        self.marked.intersection_update(self.positions)
+        self.offset = max(0, min(self.offset, len(self.keys) - self.visible))
+        self._redraw()
+
+    def insert_row(self, key):
+        self.positions[key] = len(self.keys)
+        self.keys.append(key)
+        if self.positions[key] < self.offset + self.visible:
+            self._redraw()
+        else:
+            self._update_scrollbar()
+
+    def update_row(self, key):
+        iid = str(key)
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=self.row_source(key))
+
+    def remove_row(self, key):
+        index = self.positions.pop(key, None)
+        if index is None:
+            return
+        del self.keys[index]
+        for i in range(index, len(self.keys)):
+            self.positions[self.keys[i]] = i
+        if self.selected == key:
+            self.selected = None
+        self.marked.discard(key)
+        self.offset = max(0, min(self.offset, len(self.keys) - self.visible))
+        self._redraw()
+
+    def reveal(self, key):
+        """Scroll key into view and select it; False if it is not in the table"""
+        index = self.positions.get(key)
+        if index is None:
+            return False
+        self.selected = key
+        self.marked = {key}
+        if not self.offset <= index < self.offset + self.visible:
+            self.offset = max(0, min(index - self.visible // 2, len(self.keys) - self.visible))
+        self._redraw()
+        self.tree.see(str(key))
+        return True
+
+    def selection(self):
+        return self.selected
+
+    def selections(self):
+        """Every selected key, in table order"""
+        return sorted(self.marked, key=self.positions.__getitem__)
+
+    def clear_selection(self):
+        self.selected = None
+        self.marked.clear()
+        if self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+    def scroll(self, rows):
+        offset = max(0, min(self.offset + rows, len(self.keys) - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self._redraw()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll(int(float(amount) * len(self.keys)) - self.offset)
+        elif action == "scroll":
+            self.scroll(int(amount) * (self.visible if unit == "pages" else 1))
+
+    def _on_resize(self, event):
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        visible = max(1, (event.height - self.HEADING_HEIGHT) // row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.offset = max(0, min(self.offset, len(self.keys) - self.visible))
+            self._redraw()
+
+    def _on_select(self, event):
+        selection = [self._iids[iid] for iid in self.tree.selection() if iid in self._iids]
+        # Rows scrolled out of view keep their selection; visible rows follow the tree
+        self.marked.difference_update(self._iids.values())
+        self.marked.update(selection)
+        focus = self._iids.get(self.tree.focus())
+        if focus in self.marked:
+            self.selected = focus
+        elif selection:
+            self.selected = selection[0]
+        elif self.selected not in self.marked:
+            self.selected = None
+
+    def _redraw(self):
+        self.tree.delete(*self.tree.get_children())
+        self._iids = {}
+        for key in self.keys[self.offset:self.offset + self.visible]:
+            iid = str(key)
+            self._iids[iid] = key
+            self.tree.insert("", "end", iid=iid, values=self.row_source(key))
+        visible = [str(key) for key in self.keys[self.offset:self.offset + self.visible] if key in self.marked]
+        if visible:
+            self.tree.selection_set(visible)
+        if self.selected is not None and self.tree.exists(str(self.selected)):
+            self.tree.focus(str(self.selected))
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = len(self.keys)
+        if total <= self.visible:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.visible) / total)
+
+def _photo(image, size):
+    """Resize a ticket image for display; PIL's Tk bridge loads on the first preview"""
+    from PIL import Image, ImageTk
+    if image.size != size:
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    return ImageTk.PhotoImage(image)
+
+class FerryApp(ctk.CTk):
+    def __init__(self):
+        # Set appearance
+        ctk.set_appearance_mode("light")
+        ctk.set_default_color_theme("green")
+        super().__init__()
+        
+        self.title("Montenegro Ferry E-Ticket System")
+        self.geometry("1200x800")
+        
+        self.system = open_system(DB_FILE, JOURNAL_FILE)
+        self.dashboard_table = None
+        self.dashboard_query = ""
+        self.photos = OrderedDict()  # (traveler_id, ticket_version, is_paid, size) -> PhotoImage
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Colors
+        self.green = "#00A83D"
+        self.yellow = "#FFD700"
+        
+        self.show_main_menu()
+    
+    def on_close(self):
+        self.system.shutdown(wait=False)
+        self.destroy()
+    
+    def clear_window(self):
+        for widget in self.winfo_children():
+            widget.destroy()
+    
+    def show_main_menu(self):
+        self.clear_window()
+        
+        # Main frame
+        main_frame = ctk.CTkFrame(self, fg_color="transparent")
+        main_frame.pack(expand=True, fill="both", padx=50, pady=50)
+        
+        # Title
+        title = ctk.CTkLabel(main_frame, text="Montenegro Ferry E-Ticket", 
+                            font=("Arial", 36, "bold"), text_color=self.green)
+        title.pack(pady=50)
+        
+        # Buttons
+        btn_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        btn_frame.pack(pady=30)
+        
+        traveler_btn = ctk.CTkButton(btn_frame, text="Traveler", width=200, height=50,
+                                     font=("Arial", 18, "bold"), fg_color=self.green,
+                                     hover_color="#008030", command=self.show_traveler_form)
+        traveler_btn.pack(side="left", padx=20)
+        
+        admin_btn = ctk.CTkButton(btn_frame, text="Admin", width=200, height=50,
+                                  font=("Arial", 18, "bold"), fg_color=self.green,
+                                  hover_color="#008030", command=self.show_admin_login)
+        admin_btn.pack(side="left", padx=20)
+    
+    def show_traveler_form(self):
+        self.clear_window()
+        
+        # Scrollable frame
+        scroll_frame = ctk.CTkScrollableFrame(self, width=700, height=700)
+        scroll_frame.pack(expand=True, padx=50, pady=20)
+        
+        # Title
+        title = ctk.CTkLabel(scroll_frame, text="Traveler Registration", 
+                            font=("Arial", 28, "bold"), text_color=self.green)
+        title.pack(pady=20)
+        
+        # Show departure time if set
+        if self.system.departure_time:
+            dep_label = ctk.CTkLabel(scroll_frame, text=f"Departure Time: {self.format_time_12hr(self.system.departure_time)}", 
+                                    font=("Arial", 14, "bold"), text_color=self.yellow)
+            dep_label.pack(pady=5)
+            ctk.CTkLabel(scroll_frame, text=self.seats_left_text(), font=("Arial", 14)).pack(pady=5)
+        
+        # Name
+        name_frame = ctk.CTkFrame(scroll_frame, fg_color="transparent")
+        name_frame.pack(padx=20, pady=10, fill="x")
+        ctk.CTkLabel(name_frame, text="Name:", font=("Arial", 16, "bold"), width=200).pack(side="left", padx=(0,10))
+        name_entry = ctk.CTkEntry(name_frame, width=400, height=40, font=("Arial", 14))
+        name_entry.pack(side="left")
+        
+        # Status
+        status_frame = ctk.CTkFrame(scroll_frame, fg_color="transparent")
+        status_frame.pack(padx=20, pady=10, fill="x")
+        ctk.CTkLabel(status_frame, text="Status:", font=("Arial", 16, "bold"), width=200).pack(side="left", padx=(0,10))
+        status_var = ctk.StringVar(value="Select Status")
+        status_menu = ctk.CTkOptionMenu(status_frame, values=list(STATUSES),
+                                       variable=status_var, width=400, height=40, font=("Arial", 14),
+                                       fg_color=self.green, button_color=self.green)
+        status_menu.pack(side="left")
+        
+        # Local
+        local_frame = ctk.CTkFrame(scroll_frame, fg_color="transparent")
+        local_frame.pack(padx=20, pady=10, fill="x")
+        ctk.CTkLabel(local_frame, text="Local:", font=("Arial", 16, "bold"), width=200).pack(side="left", padx=(0,10))
+        local_var = ctk.StringVar(value="Select Option")
+        local_menu = ctk.CTkOptionMenu(local_frame, values=["Yes", "No"],
+                                      variable=local_var, width=400, height=40, font=("Arial", 14),
+                                      fg_color=self.green, button_color=self.green)
+        local_menu.pack(side="left")
+        
+        # Destination
+        dest_frame = ctk.CTkFrame(scroll_frame, fg_color="transparent")
+        dest_frame.pack(padx=20, pady=10, fill="x")
+        ctk.CTkLabel(dest_frame, text="Destination:", font=("Arial", 16, "bold"), width=200).pack(side="left", padx=(0,10))
+        dest_var = ctk.StringVar(value="Select Destination")
+        dest_menu = ctk.CTkOptionMenu(dest_frame, values=list(DESTINATIONS),
+                                     variable=dest_var, width=400, height=40, font=("Arial", 14),
+                                     fg_color=self.green, button_color=self.green)
+        dest_menu.pack(side="left")
+        
+        # PWD
+        pwd_frame = ctk.CTkFrame(scroll_frame, fg_color="transparent")
+        pwd_frame.pack(padx=20, pady=10, fill="x")
+        ctk.CTkLabel(pwd_frame, text="PWD (Person with Disability):", font=("Arial", 16, "bold"), width=200).pack(side="left", padx=(0,10))
+        pwd_var = ctk.StringVar(value="No")
+        pwd_radio_frame = ctk.CTkFrame(pwd_frame, fg_color="transparent")
+        pwd_radio_frame.pack(side="left")
+        
+        ctk.CTkRadioButton(pwd_radio_frame, text="Yes", variable=pwd_var, value="Yes", 
+                          font=("Arial", 14)).pack(side="left", padx=10)
+        ctk.CTkRadioButton(pwd_radio_frame, text="No", variable=pwd_var, value="No", 
+                          font=("Arial", 14)).pack(side="left", padx=10)
+        
+        # Submit button
+        def submit_traveler():
+            name = name_entry.get()
+            status = status_var.get()
+            is_local = local_var.get() == "Yes"
+            destination = dest_var.get()
+            is_pwd = pwd_var.get() == "Yes"
+            
+            if not name or status == "Select Status" or local_var.get() == "Select Option" or dest_var.get() == "Select Destination":
+                messagebox.showerror("Error", "Please fill in all fields!")
+                return
+            
+            try:
+                traveler_id, qr_filename = self.system.register_traveler(name, status, is_local, destination, is_pwd, self.system.departure_time)
+            except SailingFull as e:
+                messagebox.showerror("Sailing Full", str(e))
+                return
+            self.show_qr_page(traveler_id, qr_filename)
+        
+        submit_btn = ctk.CTkButton(scroll_frame, text="Submit & Generate QR", width=400, height=50,
+                                  font=("Arial", 16, "bold"), fg_color=self.green,
+                                  hover_color="#008030", command=submit_traveler)
+        submit_btn.pack(pady=30)
+        
+        # Back button
+        back_btn = ctk.CTkButton(scroll_frame, text="Back to Main Menu", width=400, height=40,
+                                font=("Arial", 14), fg_color="gray", hover_color="darkgray",
+                                command=self.show_main_menu)
+        back_btn.pack(pady=10)
+    
+    def show_qr_page(self, traveler_id, qr_filename):
+        self.clear_window()
+        
+        main_frame = ctk.CTkFrame(self, fg_color="transparent")
+        main_frame.pack(expand=True, padx=50, pady=50)
+        
+        title = ctk.CTkLabel(main_frame, text="QR Code Generated!", 
+                            font=("Arial", 28, "bold"), text_color=self.green)
+        title.pack(pady=20)
+        
+        id_label = ctk.CTkLabel(main_frame, text=f"Traveler ID: {traveler_id}", 
+                               font=("Arial", 20))
+        id_label.pack(pady=10)
+        
+        # Display QR code once the background render finishes
+        qr_label = ctk.CTkLabel(main_frame, text="Rendering ticket...", font=("Arial", 16),
+                                width=300, height=300)
+        qr_label.pack(pady=20)
+        
+        def show_rendered_qr():
+            if not qr_label.winfo_exists():
+                return
+            job = self.system.ensure_ticket(traveler_id)
+            if job is not None and not job.done():
+                self.after(50, show_rendered_qr)
+                return
+            
+            try:
+                self.system.wait_for_ticket(traveler_id)
+                qr_photo = self.ticket_photo(traveler_id, (300, 300))
+            except Exception as e:
+                qr_label.configure(text=f"Ticket rendering failed: {e}", text_color="red")
+                return
+            
+            qr_label.configure(image=qr_photo, text="")
+            qr_label.image = qr_photo
+        
+        show_rendered_qr()
+        
+        # Buttons
+        btn_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        btn_frame.pack(pady=20)
+        
+        def view_full_qr():
+            if not self.ticket_ready(traveler_id):
+                return
+            
+            qr_window = Toplevel(self)
+            qr_window.title(f"Traveler {traveler_id} QR Code")
+            qr_window.geometry("600x800")
+            
+            full_photo = self.ticket_photo(traveler_id, (550, 750))
+            
+            label = ctk.CTkLabel(qr_window, image=full_photo, text="")
+            label.image = full_photo
+            label.pack(pady=20)
+        
+        view_btn = ctk.CTkButton(btn_frame, text="View Full QR", width=200, height=40,
+                                font=("Arial", 14), fg_color=self.green,
+                                command=view_full_qr)
+        view_btn.pack(side="left", padx=10)
+        
+        back_btn = ctk.CTkButton(btn_frame, text="Back to Main Menu", width=200, height=40,
+                                font=("Arial", 14), fg_color="gray",
+                                command=self.show_main_menu)
+        back_btn.pack(side="left", padx=10)
+    
+    def show_admin_login(self):
+        self.clear_window()
+        
+        main_frame = ctk.CTkFrame(self, fg_color="transparent")
+        main_frame.pack(expand=True, padx=50, pady=50)
+        
+        title = ctk.CTkLabel(main_frame, text="Admin Access", 
+                            font=("Arial", 32, "bold"), text_color=self.green)
+        title.pack(pady=50)
+        
+        ctk.CTkLabel(main_frame, text="Password:", font=("Arial", 16, "bold")).pack(pady=10)
+        password_entry = ctk.CTkEntry(main_frame, width=400, height=45, font=("Arial", 14), show="*")
+        password_entry.pack(pady=10)
+        
+        def check_password():
+            if password_entry.get() == "admin1234":
+                self.show_admin_dashboard()
+            else:
+                messagebox.showerror("Error", "❌ Incorrect password!")
+        
+        login_btn = ctk.CTkButton(main_frame, text="Login", width=400, height=50,
+                                 font=("Arial", 16, "bold"), fg_color=self.green,
+                                 hover_color="#008030", command=check_password)
+        login_btn.pack(pady=20)
+        
+        back_btn = ctk.CTkButton(main_frame, text="Back to Main Menu", width=400, height=40,
+                                font=("Arial", 14), fg_color="gray",
+                                command=self.show_main_menu)
+        back_btn.pack(pady=10)
+        
+        password_entry.bind('<Return>', lambda e: check_password())
+    
+    @timed("dashboard.build")
+    def show_admin_dashboard(self):
+        self.clear_window()
+        
+        # Main container
+        container = ctk.CTkFrame(self)
+        container.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        # Header
+        header = ctk.CTkFrame(container, fg_color=self.green, height=60)
+        header.pack(fill="x", padx=10, pady=10)
+        
+        title = ctk.CTkLabel(header, text="Admin Dashboard", 
+                            font=("Arial", 24, "bold"), text_color="white")
+        title.pack(side="left", padx=20, pady=10)
+        
+        total_label = ctk.CTkLabel(header, text=self.totals_text(), 
+                                  font=("Arial", 16), text_color="white")
+        total_label.pack(side="right", padx=20, pady=10)
+        
+        # Controls frame
+        controls = ctk.CTkFrame(container)
+        controls.pack(fill="x", padx=10, pady=10)
+        
+        # Departure time
+        left_controls = ctk.CTkFrame(controls, fg_color="transparent")
+        left_controls.pack(side="left", fill="x", expand=True)
+        
+        ctk.CTkLabel(left_controls, text="Fastcraft Departure Time:", 
+                    font=("Arial", 14, "bold")).pack(side="left", padx=5)
+        
+        time_entry = ctk.CTkEntry(left_controls, width=120, height=35, 
+                                 placeholder_text="HH:MM (24hr)")
+        time_entry.pack(side="left", padx=5)
+        
+        dep_time_label = ctk.CTkLabel(left_controls, text="", font=("Arial", 14, "bold"), 
+                                     text_color=self.green)
+        dep_time_label.pack(side="left", padx=10)
+        
+        def set_time():
+            time_val = time_entry.get()
+            if time_val.strip():
+                # FerrySystem validates and zero-pads, so "8:30" and "08:30" are the same sailing
+                try:
+                    self.system.set_departure_time(time_val)
+                except ValueError:
+                    messagebox.showerror("Error", "Invalid time! Use HH:MM format (00-23:00-59)")
+                    return
+                time_val = self.system.departure_time
+                dep_time_label.configure(text=f"Departure: {self.format_time_12hr(time_val)}")
+                messagebox.showinfo("Success", f"Departure time set to: {self.format_time_12hr(time_val)}")
+        
+        set_btn = ctk.CTkButton(left_controls, text="Set Time", width=100, height=35,
+                               fg_color=self.green, command=set_time)
+        set_btn.pack(side="left", padx=5)
+        
+        # Seats per sailing at the current departure time
+        seats_entry = ctk.CTkEntry(left_controls, width=80, height=35, placeholder_text="Seats")
+        seats_entry.pack(side="left", padx=5)
+        
+        def set_seats():
+            if not self.system.departure_time:
+                messagebox.showwarning("Warning", "Set the departure time first")
+                return
+            try:
+                seats = int(seats_entry.get())
+                if seats < 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Error", "Seats must be a whole number")
+                return
+            for destination in DESTINATIONS:
+                self.system.set_capacity(destination, self.system.departure_time, seats)
+            messagebox.showinfo("Success", self.seats_left_text())
+        
+        seats_btn = ctk.CTkButton(left_controls, text="Set Seats", width=100, height=35,
+                                 fg_color=self.green, command=set_seats)
+        seats_btn.pack(side="left", padx=5)
+        
+        # Season; switching reprices every unpaid ticket in one pass
+        summer_var = ctk.BooleanVar(value=self.system.is_summer)
+        
+        def toggle_summer():
+            changed = self.system.set_summer(summer_var.get())
+            season = "Summer" if summer_var.get() else "Regular"
+            messagebox.showinfo("Success", f"{season} fares applied; {changed} unpaid ticket(s) repriced")
+        
+        summer_switch = ctk.CTkSwitch(left_controls, text="Summer Fares", variable=summer_var,
+                                      font=("Arial", 14, "bold"), command=toggle_summer)
+        summer_switch.pack(side="left", padx=10)
+        
+        # Search
+        right_controls = ctk.CTkFrame(controls, fg_color="transparent")
+        right_controls.pack(side="right")
+        
+        ctk.CTkLabel(right_controls, text="Search:", 
+                    font=("Arial", 14, "bold")).pack(side="left", padx=5)
+        
+        search_entry = ctk.CTkEntry(right_controls, width=200, height=35, 
+                                   placeholder_text="Name or Traveler ID")
+        search_entry.pack(side="left", padx=5)
+        
+        # The table narrows to the best matches as the admin types; names
+        # registered since the last search are indexed off the Tk thread
+        self.dashboard_query = ""
+        threading.Thread(target=self.system.search_index.catch_up, name="search-index", daemon=True).start()
+        search_job = None
+        
+        def run_search():
+            nonlocal search_job
+            search_job = None
+            self.dashboard_query = search_entry.get().strip()
+            self.refresh_dashboard()
+        
+        def on_search_key(event):
+            nonlocal search_job
+            if search_job is not None:
+                self.after_cancel(search_job)
+            search_job = self.after(SEARCH_DELAY_MS, run_search)
+        
+        search_entry.bind("<KeyRelease>", on_search_key)
+        
+        def search_traveler():
+            query = search_entry.get().strip()
+            if not query:
+                messagebox.showwarning("Warning", "Please enter a name or Traveler ID")
+                return
+            
+            run_search()
+            if not table.keys:
+                messagebox.showinfo("Not Found", f"No traveler matches {query}")
+                return
+            table.reveal(table.keys[0])
+        
+        search_entry.bind("<Return>", lambda e: search_traveler())
+        
+        def clear_search():
+            search_entry.delete(0, 'end')
+            table.clear_selection()
+            run_search()
+        
+        search_btn = ctk.CTkButton(right_controls, text="Search", width=100, height=35,
+                                  fg_color=self.green, command=search_traveler)
+        search_btn.pack(side="left", padx=5)
+        
+        clear_btn = ctk.CTkButton(right_controls, text="Clear", width=100, height=35,
+                                 fg_color="gray", command=clear_search)
+        clear_btn.pack(side="left", padx=5)
+        
+        # Table frame
+        table_frame = ctk.CTkFrame(container)
+        table_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        # Create Treeview (only the visible rows are ever inserted)
+        columns = ("ID", "Name", "Status", "Local", "PWD", "Destination", "Departure", "Fare", "Paid")
+        table = VirtualTable(table_frame, columns, self.dashboard_row)
+        tree = table.tree
+        
+        # Column headings
+        for col in columns:
+            tree.heading(col, text=col)
+            if col == "Name":
+                tree.column(col, width=150)
+            elif col == "Destination":
+                tree.column(col, width=100)
+            else:
+                tree.column(col, width=80)
+        
+        # Pack
+        tree.pack(side="left", fill="both", expand=True)
+        table.scrollbar.pack(side="right", fill="y")
+        
+        self.dashboard_table = table
+        self.dashboard_total_label = total_label
+        self.refresh_dashboard()
+        
+        # Apply FerrySystem changes as row diffs, once per frame
+        def apply_changes(events):
+            added, changed = [], set()
+            for event in events:
+                if event.kind == TRAVELER_ADDED:
+                    added.append(event.traveler_id)
+                elif event.traveler_id is not None:
+                    changed.add(event.traveler_id)
+            if added and self.dashboard_query:
+                # A new traveler may match the search, so rank it again
+                self.refresh_dashboard()
+            else:
+                for traveler_id in added:
+                    table.insert_row(traveler_id)
+            for traveler_id in changed:
+                table.update_row(traveler_id)
+            total_label.configure(text=self.totals_text())
+        
+        EventCoalescer(tree, self.system, timed("dashboard.apply_changes")(apply_changes))
+        
+        # Action buttons
+        action_frame = ctk.CTkFrame(container)
+        action_frame.pack(fill="x", padx=10, pady=10)
+        
+        def mark_paid():
+            traveler_ids = table.selections()
+            if not traveler_ids:
+                messagebox.showwarning("Warning", "Please select a traveler")
+                return
+            
+            # One transaction for the whole selection; the rows update on the next frame
+            try:
+                self.system.mark_many_paid(traveler_ids, self.system.departure_time)
+            except SailingFull as e:
+                messagebox.showerror("Sailing Full", str(e))
+                return
+            if len(traveler_ids) == 1:
+                messagebox.showinfo("Success", f"Traveler {traveler_ids[0]} marked as paid!")
+            else:
+                messagebox.showinfo("Success", f"{len(traveler_ids)} travelers marked as paid!")
+        
+        def reissue():
+            traveler_ids = table.selections()
+            if not traveler_ids:
+                messagebox.showwarning("Warning", "Please select a traveler")
+                return
+            departure = self.system.departure_time
+            where = f" for the {self.format_time_12hr(departure)} departure" if departure else ""
+            if not messagebox.askyesno("Reissue Tickets",
+                                       f"Reissue {len(traveler_ids)} ticket(s){where}? Old QR codes will stop working."):
+                return
+            try:
+                self.system.reissue_tickets(traveler_ids, departure)
+            except SailingFull as e:
+                messagebox.showerror("Sailing Full", str(e))
+                return
+            messagebox.showinfo("Success", f"{len(traveler_ids)} ticket(s) reissued")
+        
+        def view_qr():
+            traveler_id = table.selection()
+            if traveler_id is None:
+                messagebox.showwarning("Warning", "Please select a traveler")
+                return
+            
+            t = self.system.get_traveler(traveler_id)
+            if t is None or not self.ticket_ready(traveler_id):
+                return
+            
+            qr_window = Toplevel(self)
+            qr_window.title(f"Traveler {traveler_id} QR Code")
+            qr_window.geometry("600x800")
+            
+            try:
+                qr_photo = self.ticket_photo(traveler_id, (550, 750))
+                
+                label = ctk.CTkLabel(qr_window, image=qr_photo, text="")
+                label.image = qr_photo
+                label.pack(pady=20)
+            except Exception as e:
+                ctk.CTkLabel(qr_window, text=f"Error loading QR: {e}").pack()
+        
+        mark_btn = ctk.CTkButton(action_frame, text="Mark as Paid", width=150, height=40,
+                                fg_color=self.green, command=mark_paid)
+        mark_btn.pack(side="left", padx=10)
+        
+        reissue_btn = ctk.CTkButton(action_frame, text="Reissue Tickets", width=150, height=40,
+                                   fg_color=self.green, command=reissue)
+        reissue_btn.pack(side="left", padx=10)
+        
+        view_btn = ctk.CTkButton(action_frame, text="View QR Code", width=150, height=40,
+                                fg_color=self.yellow, text_color="black", command=view_qr)
+        view_btn.pack(side="left", padx=10)
+        
+        def print_tickets():
+            traveler_ids = table.selections()
+            if not traveler_ids:
+                messagebox.showwarning("Warning", "Please select a traveler")
+                return
+            path = filedialog.asksaveasfilename(parent=self, defaultextension=".pdf",
+                                                filetypes=[("PDF files", "*.pdf")],
+                                                initialfile="tickets.pdf")
+            if not path:
+                return
+            travelers = [self.system.get_traveler(traveler_id) for traveler_id in traveler_ids]
+            
+            # A whole sailing takes seconds to draw, so it goes to the render pool like any ticket
+            job = self.system.render_executor.submit(write_pdf, self.system, travelers, path)
+            print_btn.configure(state="disabled", text="Printing...")
+            
+            def report():
+                if not job.done():
+                    self.after(100, report)
+                    return
+                if print_btn.winfo_exists():
+                    print_btn.configure(state="normal", text="Print Tickets")
+                error = job.exception()
+                if error is not None:
+                    messagebox.showerror("Error", f"Printing failed: {error}")
+                else:
+                    messagebox.showinfo("Success", f"{len(travelers)} ticket(s) on {job.result()} page(s) saved to {path}")
+            
+            report()
+        
+        print_btn = ctk.CTkButton(action_frame, text="Print Tickets", width=150, height=40,
+                                 fg_color=self.yellow, text_color="black", command=print_tickets)
+        print_btn.pack(side="left", padx=10)
+        
+        def export_csv():
+            path = filedialog.asksaveasfilename(parent=self, defaultextension=".csv",
+                                                filetypes=[("CSV files", "*.csv")],
+                                                initialfile="manifest.csv")
+            if not path:
+                return
+            try:
+                count = export_manifest(self.system, path, "csv")
+            except OSError as e:
+                messagebox.showerror("Error", f"Export failed: {e}")
+                return
+            messagebox.showinfo("Success", f"Exported {count} travelers to {path}")
+        
+        export_btn = ctk.CTkButton(action_frame, text="Export CSV", width=150, height=40,
+                                  fg_color="gray", command=export_csv)
+        export_btn.pack(side="left", padx=10)
+        
+        refresh_btn = ctk.CTkButton(action_frame, text="Refresh", width=150, height=40,
+                                   fg_color="gray", command=self.refresh_dashboard)
+        refresh_btn.pack(side="left", padx=10)
+        
+        back_btn = ctk.CTkButton(action_frame, text="Back to Main Menu", width=150, height=40,
+                                fg_color="darkgray", command=self.show_main_menu)
+        back_btn.pack(side="right", padx=10)
+        
+        # Update departure time display if set
+        if self.system.departure_time:
+            dep_time_label.configure(text=f"Departure: {self.format_time_12hr(self.system.departure_time)}")
+    
+    def dashboard_row(self, traveler_id):
+        t = self.system.get_traveler(traveler_id)
+        return (
+            t.traveler_id,
+            t.name,
+            t.status.title(),
+            "Yes" if t.is_local else "No",
+            "Yes" if t.is_pwd else "No",
+            t.destination.title(),
+            self.format_time_12hr(t.departure_time) if t.departure_time else "-",
+            f"₱{t.fare:.2f}",
+            "✓ Paid" if t.is_paid else "Not Paid"
+        )
+    
+    @timed("dashboard.refresh")
+    def refresh_dashboard(self):
+        """Reload the dashboard rows in place, without rebuilding its widgets"""
+        table = self.dashboard_table
+        if table is None or not table.tree.winfo_exists():
+            return
+        if self.dashboard_query:
+            table.set_rows(t.traveler_id for t in self.system.search(self.dashboard_query, SEARCH_MATCHES))
+        else:
+            table.set_rows(self.system.travelers.ids)
+        self.dashboard_total_label.configure(text=self.totals_text())
+    
+    @timed("gui.ticket_photo")
+    def ticket_photo(self, traveler_id, size):
+        """PhotoImage of a ticket preview; reused until the ticket is reissued or paid"""
+        t = self.system.get_traveler(traveler_id)
+        key = (t.traveler_id, t.ticket_version, t.is_paid, size)
+        photo = self.photos.get(key)
+        if photo is None:
+            photo = _photo(self.system.open_preview(traveler_id, size), size)
+            self.photos[key] = photo
+            if len(self.photos) > PHOTO_CACHE_SIZE:
+                self.photos.popitem(last=False)
+        else:
+            self.photos.move_to_end(key)
+        return photo
+    
+    def ticket_ready(self, traveler_id):
+        """Report a pending or failed ticket render; True when the image can be opened"""
+        job = self.system.ensure_ticket(traveler_id)
+        if job is None:
+            return True
+        if not job.done():
+            messagebox.showinfo("Please Wait", f"Ticket for traveler {traveler_id} is still rendering")
+            return False
+        error = job.exception()
+        if error is not None:
+            messagebox.showerror("Error", f"Ticket rendering failed: {error}")
+            return False
+        return True
+    
+    def totals_text(self):
+        """Passenger count and fares collected/due, from the table's running totals"""
+        travelers = self.system.travelers
+        return (f"Total Passengers: {len(travelers)} | Collected ₱{travelers.total_fare(True):,.2f}"
+                f" | Due ₱{travelers.total_fare(False):,.2f}")
+    
+    def seats_left_text(self):
+        """Seats left on each destination's sailing at the current departure time"""
+        parts = []
+        for destination in DESTINATIONS:
+            sailing = self.system.get_sailing(destination, self.system.departure_time)
+            seats = sailing.seats_left if sailing else self.system.sailings.default_capacity
+            parts.append(f"{destination}: {seats} seats left")
+        return " | ".join(parts)
+    
+    def format_time_12hr(self, time_24):
+        """Convert 24-hour time to 12-hour format with AM/PM"""
+        try:
+            h, m = map(int, time_24.split(':'))
+            ampm = 'PM' if h >= 12 else 'AM'
+            h12 = h % 12 or 12
+            return f"{h12}:{m:02d} {ampm}"
+        except (ValueError, AttributeError):
+            return time_24
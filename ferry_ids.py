@@ -0,0 +1,41 @@
+import threading
+
+# Constants
+ID_BLOCK_SIZE = 64
+
+class IdAllocator:
+    """Hands out unique traveler IDs from per-thread blocks
+
+    Each thread (ticket counter, batch worker, ...) reserves a block of
+    block_size IDs under a lock and then allocates from it without any
+    locking, so counters only meet once per block. IDs are unique but are
+    only sequential within one thread's block; the unused tail of a block
+    is skipped after a restart.
+    """
+    def __init__(self, start=101, block_size=ID_BLOCK_SIZE):
+        self.block_size = block_size
+        self.next_free = start
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def reserve_block(self, size=None):
+        """Take the next size IDs for the caller; returns a range"""
+        size = size or self.block_size
+        with self._lock:
+            start = self.next_free
+            self.next_free += size
+            return range(start, start + size)
+
+    def next_id(self):
+        local = self._local
+        traveler_id = next(getattr(local, "ids", iter(())), None)
+        if traveler_id is None:
+            local.ids = iter(self.reserve_block())
+            traveler_id = next(local.ids)
+        return traveler_id
+
+    def advance_past(self, traveler_id):
+        """Never hand out traveler_id or anything below it again"""
+        with self._lock:
+            # Every ID handed out so far is below next_free, so blocks in use stay valid
+            self.next_free = max(self.next_free, traveler_id + 1)
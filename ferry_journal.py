@@ -0,0 +1,227 @@
+import datetime
+import json
+import os
+import shutil
+import threading
+
+# Constants
+JOURNAL_FILE = "ticket_logs.jsonl"
+SNAPSHOT_FILE = "ferry_snapshot.json"
+FSYNC_POLICIES = ("always", "group", "never")
+GROUP_SIZE = 64
+GROUP_INTERVAL = 0.05  # seconds an event may wait for its group to commit
+SNAPSHOT_EVERY = 10000  # events between automatic snapshots
+
+def snapshot_path_for(journal_path):
+    """The snapshot file belonging to a journal: SNAPSHOT_FILE in the same folder"""
+    return os.path.join(os.path.dirname(journal_path), SNAPSHOT_FILE)
+
+class TicketJournal:
+    """Append-only ticket_logs journal with group commit and snapshots
+
+    Events are buffered and written as one group, then fsynced according
+    to the policy:
+      "always" - write and fsync on every append (nothing is ever lost)
+      "group"  - write and fsync each group (at most GROUP_INTERVAL lost)
+      "never"  - write each group, leave flushing to the OS
+    Committed groups are also handed to the store's ticket_logs table.
+    Snapshots are written by the committer thread too (request_snapshot),
+    never by the thread whose event crossed snapshot_every.
+    """
+    def __init__(self, path=JOURNAL_FILE, snapshot_path=None, fsync="group", group_size=GROUP_SIZE,
+                 group_interval=GROUP_INTERVAL, snapshot_every=SNAPSHOT_EVERY, store=None):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, not {fsync!r}")
+        self.path = path
+        # The snapshot sits next to its journal, so every tool opening the journal finds it
+        self.snapshot_path = snapshot_path or snapshot_path_for(path)
+        self.fsync = fsync
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self.snapshot_every = snapshot_every
+        self.store = store
+
+        snapshot = self.load_snapshot()
+        self.snapshot_log_id = snapshot["log_id"] if snapshot else 0
+        log_ids = [e["log_id"] for e in self.read_entries()]
+        self.first_log_id = min(log_ids, default=None)
+        self.last_log_id = max([self.snapshot_log_id] + log_ids)
+        self.since_snapshot = self.last_log_id - self.snapshot_log_id
+
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._snapshot_system = None
+        self._snapshot_pending = False
+        # Commits groups and writes snapshots; with "always" it only writes snapshots
+        self._committer = threading.Thread(target=self._commit_loop, name="journal-commit", daemon=True)
+        self._committer.start()
+
+    def append(self, traveler_id, action, details=None):
+        """Record one event and return its log_id"""
+        return self.append_many([(traveler_id, action, details)])
+
+    def append_many(self, events):
+        """Record (traveler_id, action, details) events so they are committed in the same group
+
+        Returns the log_id of the last one.
+        """
+        timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock:
+            for traveler_id, action, details in events:
+                self.last_log_id += 1
+                self.since_snapshot += 1
+                self._buffer.append({
+                    "log_id": self.last_log_id,
+                    "traveler_id": traveler_id,
+                    "action": action,
+                    "timestamp": timestamp,
+                    "details": details or {},
+                })
+            log_id = self.last_log_id
+            if self.fsync == "always":
+                self._commit_locked()
+            elif len(self._buffer) >= self.group_size:
+                self._wakeup.set()
+        return log_id
+
+    def _commit_loop(self):
+        while not self._closed:
+            self._wakeup.wait(self.group_interval)
+            self._wakeup.clear()
+            self.commit()
+            system, self._snapshot_system = self._snapshot_system, None
+            if system is not None:
+                try:
+                    self.snapshot(system)
+                except OSError:
+                    pass  # since_snapshot is unchanged, so the next event asks again
+                finally:
+                    self._snapshot_pending = False
+
+    def commit(self):
+        """Write every buffered event as one group"""
+        with self._lock:
+            self._commit_locked()
+
+    def _commit_locked(self):
+        if not self._buffer:
+            return
+        group, self._buffer = self._buffer, []
+        self._file.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in group))
+        self._file.flush()
+        if self.fsync != "never":
+            os.fsync(self._file.fileno())
+        if self.store is not None:
+            # System-wide events (traveler_id None) are kept by the store elsewhere, e.g. in settings
+            self.store.append_logs(
+                (e["traveler_id"], e["action"], e["timestamp"], json.dumps(e["details"], ensure_ascii=False))
+                for e in group if e["traveler_id"] is not None)
+
+    def read_entries(self, after_log_id=0):
+        """Yield committed events newer than after_log_id, skipping a torn final line"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry["log_id"] > after_log_id:
+                    yield entry
+
+    def load_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return None
+        with open(self.snapshot_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def is_complete(self):
+        """True when the snapshot and journal hold every event since the first
+
+        A journal is cut back after each snapshot, so without its snapshot
+        (or an entry with log_id 1) the travelers before it are unknown.
+        """
+        return os.path.exists(self.snapshot_path) or self.first_log_id == 1
+
+    def replay(self, system):
+        """Rebuild system state from the latest snapshot plus the events after it"""
+        snapshot = self.load_snapshot()
+        after = 0
+        if snapshot:
+            after = snapshot["log_id"]
+            system.is_summer = snapshot["is_summer"]
+            for sailing in snapshot.get("sailings", ()):
+                system.sailings.add_sailing(sailing["destination"], sailing["departure_time"], sailing["capacity"])
+            for row in snapshot["travelers"]:
+                system.restore_traveler(row)
+            system.next_id = max(system.next_id, snapshot["next_id"])
+        count = 0
+        for entry in self.read_entries(after):
+            system.apply_log_entry(entry)
+            count += 1
+        return count
+
+    def needs_snapshot(self):
+        return not self._snapshot_pending and self.since_snapshot >= self.snapshot_every
+
+    def request_snapshot(self, system):
+        """Have the committer thread write a snapshot, so the caller never waits for one"""
+        self._snapshot_pending = True
+        self._snapshot_system = system
+        self._wakeup.set()
+
+    def snapshot(self, system):
+        """Write the full state atomically, then drop the events it covers from the journal
+
+        The journal lock is only held to commit and, at the end, to copy
+        the events logged while the state was being written; appends go on
+        meanwhile. Every change is applied before it is logged, so the
+        state holds at least every event up to log_id, and replaying any
+        newer event it already holds is a no-op.
+        """
+        with self._lock:
+            self._commit_locked()
+            log_id = self.last_log_id
+            offset = self._file.tell()
+
+        state = {
+            "log_id": log_id,
+            "next_id": system.next_id,
+            "is_summer": system.is_summer,
+            "sailings": [{"destination": sailing.destination, "departure_time": sailing.departure_time,
+                          "capacity": sailing.capacity} for sailing in system.sailings],
+            "travelers": system.get_all_travelers(),
+        }
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        with self._lock:
+            self._commit_locked()
+            # Keep only the events after log_id; the swap is atomic, so a crash leaves one journal or the other
+            self._file.close()
+            tmp_path = self.path + ".tmp"
+            with open(self.path, "rb") as src, open(tmp_path, "wb") as dst:
+                src.seek(offset)
+                shutil.copyfileobj(src, dst)
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self.snapshot_log_id = log_id
+            self.since_snapshot = self.last_log_id - log_id
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+        if self._committer is not None:
+            self._committer.join()
+        self.commit()
+        self._file.close()
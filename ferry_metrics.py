@@ -0,0 +1,196 @@
+"""Timing spans, counters and latency histograms for FerrySystem operations
+
+Off by default. Turn on with FERRY_METRICS=1 (and optionally
+FERRY_METRICS_DUMP=metrics.json to write a snapshot every few seconds),
+or with METRICS.enable(). When disabled, a span is one attribute check
+and a shared no-op context manager.
+
+Ticket renders are split into render.draw (which includes
+render.qr_encode), render.save and render.previews. Spans recorded in
+ProcessPoolExecutor workers (ferry_batch) stay in the worker process
+and are not reported.
+"""
+import bisect
+import functools
+import json
+import math
+import os
+import threading
+import time
+
+# Constants
+METRICS_ENV = "FERRY_METRICS"
+DUMP_ENV = "FERRY_METRICS_DUMP"
+DUMP_INTERVAL = 10.0  # seconds between periodic dumps
+BUCKETS_MS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class Histogram:
+    """Latency distribution in fixed millisecond buckets"""
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples"""
+        if not self.count:
+            return None
+        rank = math.ceil(self.count * fraction)
+        seen = 0
+        for bound, count in zip(BUCKETS_MS + (self.max,), self.counts):
+            seen += count
+            if seen >= rank:
+                return round(min(bound, self.max), 4)
+        return round(self.max, 4)
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 4) if self.count else None,
+            "p50_ms": self.percentile(0.50),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max, 4),
+        }
+
+class _Span:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.name, (time.perf_counter() - self.start) * 1000)
+        if exc_type is not None:
+            self.metrics.count(self.name + ".errors")
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+NULL_SPAN = _NullSpan()
+
+class Metrics:
+    """Process-wide counters and histograms, safe to update from any thread"""
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.counters = {}
+        self.histograms = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._dumper = None
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+            self.started = time.time()
+
+    def span(self, name):
+        """Context manager timing its body into the histogram called name"""
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name)
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, ms):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(ms)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "since": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started)),
+                "counters": dict(sorted(self.counters.items())),
+                "spans": {name: h.to_dict() for name, h in sorted(self.histograms.items())},
+            }
+
+    def render_text(self):
+        """Prometheus text exposition of every counter and histogram"""
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = "ferry_" + name.replace(".", "_")
+                lines.append(f"# TYPE {metric}_total counter")
+                lines.append(f"{metric}_total {value}")
+            for name, h in sorted(self.histograms.items()):
+                metric = "ferry_" + name.replace(".", "_") + "_ms"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(BUCKETS_MS, h.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {h.count}')
+                lines.append(f"{metric}_sum {h.total:.4f}")
+                lines.append(f"{metric}_count {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Write a JSON snapshot atomically"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    def start_dumping(self, path, interval=DUMP_INTERVAL):
+        """Dump to path every interval seconds from a daemon thread"""
+        if self._dumper is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.dump(path)
+
+        self._dumper = threading.Thread(target=loop, name="metrics-dump", daemon=True)
+        self._dumper.start()
+
+    def configure_from_env(self):
+        """Apply FERRY_METRICS / FERRY_METRICS_DUMP; entry points call this once"""
+        if os.environ.get(METRICS_ENV) or os.environ.get(DUMP_ENV):
+            self.enable()
+        if os.environ.get(DUMP_ENV):
+            self.start_dumping(os.environ[DUMP_ENV])
+
+METRICS = Metrics(enabled=bool(os.environ.get(METRICS_ENV)))
+
+def timed(name):
+    """Decorator form of METRICS.span(name)"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return fn(*args, **kwargs)
+            with _Span(METRICS, name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,263 @@
+"""Print sheets and PDFs of many tickets at once
+
+    python ferry_print.py --db ferry_system.db --destination Tingloy --departure 08:30 -o tingloy_0830.pdf
+    python ferry_print.py --journal ticket_logs.jsonl --ids 101 102 103 -o group.pdf --layout 2x2
+    python ferry_print.py --db ferry_system.db --destination Mabini --departure 14:30 -o sheets --format png
+
+Tickets use the same layout and payment stamp as the ticket files, but
+are drawn straight at their printed size by a scaled TicketTemplate, so
+nothing full-size is rendered, saved or resized. Pages are composed and
+written one at a time; the PDF writer keeps only byte offsets of what it
+has already written, so a sailing of any size prints in bounded memory.
+With --workers, whole pages are drawn in a process pool and come back
+already compressed.
+"""
+import argparse
+import itertools
+import os
+import sys
+import zlib
+from ferry_render import BLACK_THRESHOLD, TICKET_HEIGHT, TICKET_WIDTH, get_ticket_template
+
+# Constants
+PAGE_SIZES_MM = {"a4": (210.0, 297.0), "letter": (215.9, 279.4)}
+PRINT_DPI = 300
+MARGIN_MM = 8.0
+GUTTER_MM = 4.0
+CROP_MARK = 24  # pixels of each corner mark around a ticket
+PAGES_IN_FLIGHT = 8  # pages handed to an executor at once
+PRINT_FORMATS = ("pdf", "png")
+ONE_BIT = [0] * BLACK_THRESHOLD + [255] * (256 - BLACK_THRESHOLD)  # point() table, as save_ticket thresholds
+
+class SheetLayout:
+    """Where columns x rows tickets go on a page, and the template scale that fits them"""
+    def __init__(self, columns=3, rows=2, page="a4", dpi=PRINT_DPI, margin_mm=MARGIN_MM, gutter_mm=GUTTER_MM):
+        if page not in PAGE_SIZES_MM:
+            raise ValueError(f"page must be one of {tuple(PAGE_SIZES_MM)}, not {page!r}")
+        if columns < 1 or rows < 1:
+            raise ValueError("a sheet needs at least one column and one row")
+
+        def px(mm):
+            return round(mm / 25.4 * dpi)
+
+        self.columns = columns
+        self.rows = rows
+        self.dpi = dpi
+        self.page_size = tuple(px(mm) for mm in PAGE_SIZES_MM[page])
+        margin, gutter = px(margin_mm), px(gutter_mm)
+        cell_w = (self.page_size[0] - 2 * margin - (columns - 1) * gutter) / columns
+        cell_h = (self.page_size[1] - 2 * margin - (rows - 1) * gutter) / rows
+        self.scale = round(min(cell_w / TICKET_WIDTH, cell_h / TICKET_HEIGHT), 4)
+        template = get_ticket_template(self.scale)
+        self.ticket_size = (template.width, template.height)
+
+        # Each ticket is centred in its cell
+        self.positions = [
+            (round(margin + c * (cell_w + gutter) + (cell_w - template.width) / 2),
+             round(margin + r * (cell_h + gutter) + (cell_h - template.height) / 2))
+            for r in range(rows) for c in range(columns)
+        ]
+
+    @property
+    def per_page(self):
+        return self.columns * self.rows
+
+    def compose(self, tickets):
+        """One 1-bit page with the given ticket images and crop marks at their corners"""
+        from PIL import Image, ImageDraw
+
+        page = Image.new('L', self.page_size, 255)
+        draw = ImageDraw.Draw(page)
+        w, h = self.ticket_size
+        for (x, y), ticket in zip(self.positions, tickets):
+            page.paste(ticket, (x, y))
+            for cx, cy, dx, dy in ((x, y, -1, -1), (x + w, y, 1, -1), (x, y + h, -1, 1), (x + w, y + h, 1, 1)):
+                draw.line((cx + dx * 4, cy, cx + dx * CROP_MARK, cy), fill=0, width=2)
+                draw.line((cx, cy + dy * 4, cx, cy + dy * CROP_MARK), fill=0, width=2)
+        return page.point(ONE_BIT, "1")
+
+def parse_layout(text):
+    """'3x2' -> (columns, rows)"""
+    try:
+        columns, rows = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"layout must look like 3x2, not {text!r}") from None
+    return columns, rows
+
+def render_sheet(layout, tickets):
+    """A page of (qr_data, traveler_id, details, is_paid) tickets drawn at print size"""
+    template = get_ticket_template(layout.scale)
+    images = []
+    for qr_data, traveler_id, details, is_paid in tickets:
+        ticket = template.render(qr_data, traveler_id, details)
+        template.stamp_status(ticket, is_paid)
+        images.append(ticket)
+    return layout.compose(images)
+
+def render_pdf_page(layout, tickets):
+    """render_sheet packed for PdfSpooler: (width, height, Flate-compressed 1-bit rows)
+
+    Module-level and returning only compressed bytes, so a process pool
+    can do the whole page and send back a few kilobytes.
+    """
+    page = render_sheet(layout, tickets)
+    # PIL packs 1-bit rows to whole bytes with 1 = white, as PDF's DeviceGray expects
+    return page.width, page.height, zlib.compress(page.tobytes())
+
+def _page_batches(system, travelers, per_page):
+    page = []
+    for t in travelers:
+        qr_data, details = system.ticket_content(t)
+        page.append((qr_data, t.traveler_id, details, t.is_paid))
+        if len(page) == per_page:
+            yield page
+            page = []
+    if page:
+        yield page
+
+def iter_pages(system, travelers, layout, render_page=render_sheet, executor=None):
+    """Yield render_page(layout, tickets) for each page, in order
+
+    At most PAGES_IN_FLIGHT pages are handed to the executor at once, so
+    memory stays bounded however many travelers are printed.
+    """
+    batches = _page_batches(system, travelers, layout.per_page)
+    while True:
+        chunk = list(itertools.islice(batches, PAGES_IN_FLIGHT))
+        if not chunk:
+            return
+        if executor is None:
+            yield from (render_page(layout, tickets) for tickets in chunk)
+        else:
+            yield from executor.map(render_page, itertools.repeat(layout), chunk)
+
+class PdfSpooler:
+    """Writes 1-bit page images to a PDF file as they arrive
+
+    Each page is one Flate-compressed image XObject; only the byte offsets
+    of written objects are kept until close() writes the page tree and
+    cross-reference table.
+    """
+    def __init__(self, f, dpi=PRINT_DPI):
+        self.f = f
+        self.dpi = dpi
+        self.offsets = {}
+        self.page_ids = []
+        self.next_id = 3  # 1 is the catalog and 2 the page tree, both written last
+        self.position = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data):
+        self.f.write(data)
+        self.position += len(data)
+
+    def _object(self, body, stream=None, obj_id=None):
+        if obj_id is None:
+            obj_id = self.next_id
+            self.next_id += 1
+        self.offsets[obj_id] = self.position
+        self._write(b"%d 0 obj\n" % obj_id + body)
+        if stream is not None:
+            self._write(b"\nstream\n" + stream + b"\nendstream")
+        self._write(b"\nendobj\n")
+        return obj_id
+
+    def add_page(self, width, height, data):
+        """Append a full-page 1-bit image from render_pdf_page"""
+        image_id = self._object(b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray "
+                                b"/BitsPerComponent 1 /Filter /FlateDecode /Length %d >>" % (width, height, len(data)),
+                                data)
+        w_pt, h_pt = width * 72 / self.dpi, height * 72 / self.dpi
+        content = b"q %.2f 0 0 %.2f 0 0 cm /Im0 Do Q" % (w_pt, h_pt)
+        content_id = self._object(b"<< /Length %d >>" % len(content), content)
+        self.page_ids.append(self._object(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Resources << /XObject << /Im0 %d 0 R >> >> "
+            b"/Contents %d 0 R >>" % (w_pt, h_pt, image_id, content_id)))
+
+    def close(self):
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self.page_ids)
+        self._object(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.page_ids)), obj_id=2)
+        self._object(b"<< /Type /Catalog /Pages 2 0 R >>", obj_id=1)
+        xref = self.position
+        count = self.next_id
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n" % count)
+        self._write(b"".join(b"%010d 00000 n \n" % self.offsets[obj_id] for obj_id in range(1, count)))
+        self._write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (count, xref))
+
+def write_pdf(system, travelers, path, layout=None, executor=None):
+    """Print travelers' tickets into one multi-page PDF; returns the page count"""
+    layout = layout or SheetLayout()
+    with open(path, "wb") as f:
+        spooler = PdfSpooler(f, layout.dpi)
+        for width, height, data in iter_pages(system, travelers, layout, render_pdf_page, executor):
+            spooler.add_page(width, height, data)
+        spooler.close()
+    return len(spooler.page_ids)
+
+def write_sheets(system, travelers, folder, layout=None, executor=None):
+    """Print travelers' tickets as numbered 1-bit PNG sheets in folder; returns their paths"""
+    layout = layout or SheetLayout()
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for number, page in enumerate(iter_pages(system, travelers, layout, executor=executor), start=1):
+        path = os.path.join(folder, f"sheet_{number:03d}.png")
+        page.save(path, "PNG", dpi=(layout.dpi, layout.dpi))
+        paths.append(path)
+    return paths
+
+def main(argv=None):
+    from concurrent.futures import ProcessPoolExecutor
+    from ferry_core import QR_FOLDER, FerrySystem, open_system
+
+    parser = argparse.ArgumentParser(description="Print many tickets as multi-up sheets or one PDF")
+    parser.add_argument("--db", help="SQLite database the travelers are stored in")
+    parser.add_argument("--journal", help="ticket_logs journal file the travelers are stored in")
+    parser.add_argument("--qr-folder", default=QR_FOLDER, help="where ticket images are written")
+    parser.add_argument("--destination", help="print this sailing's manifest (with --departure)")
+    parser.add_argument("--departure", help="departure time (HH:MM) of the sailing to print")
+    parser.add_argument("--ids", type=int, nargs="+", help="print these travelers instead of a sailing")
+    parser.add_argument("-o", "--output", required=True, help="PDF file, or folder for PNG sheets")
+    parser.add_argument("--format", choices=PRINT_FORMATS, help="output format (default: pdf for .pdf names)")
+    parser.add_argument("--layout", default="3x2", help="tickets per page as COLUMNSxROWS")
+    parser.add_argument("--page", choices=tuple(PAGE_SIZES_MM), default="a4")
+    parser.add_argument("--dpi", type=int, default=PRINT_DPI)
+    parser.add_argument("--workers", type=int, default=0, help="render processes (default: render in this one)")
+    args = parser.parse_args(argv)
+    try:
+        args.departure = FerrySystem.normalize_departure(args.departure)
+    except ValueError as e:
+        parser.error(str(e))
+    if not args.db and not args.journal:
+        parser.error("--db or --journal is needed to load the travelers")
+    if not args.ids and not (args.destination and args.departure):
+        parser.error("give --ids, or --destination and --departure")
+    try:
+        layout = SheetLayout(*parse_layout(args.layout), page=args.page, dpi=args.dpi)
+    except ValueError as e:
+        parser.error(str(e))
+    output_format = args.format or ("pdf" if args.output.lower().endswith(".pdf") else "png")
+
+    system = open_system(args.db, args.journal, qr_folder=args.qr_folder)
+    executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 0 else None
+    try:
+        if args.ids:
+            travelers = [system.get_traveler(traveler_id) for traveler_id in args.ids]
+            missing = [traveler_id for traveler_id, t in zip(args.ids, travelers) if t is None]
+            if missing:
+                print(f"error: unknown traveler IDs {missing}", file=sys.stderr)
+                return 2
+        else:
+            travelers = system.get_manifest(args.destination.title(), args.departure)
+        if output_format == "pdf":
+            pages = write_pdf(system, travelers, args.output, layout, executor)
+        else:
+            pages = len(write_sheets(system, travelers, args.output, layout, executor))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        system.shutdown()
+    print(f"Printed {len(travelers)} tickets on {pages} pages to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+import os
+import threading
+from ferry_metrics import METRICS
+
+# PIL and qrcode are imported inside the functions that need them, so
+# importing this module (and ferry_core) costs nothing until the first render
+
+# Ticket layout
+TICKET_WIDTH = 1080
+TICKET_HEIGHT = 1920
+QR_SIZE = 800
+QR_Y = 400
+QR_BORDER = 2
+QR_MASK_PATTERN = 0  # any mask is valid; skipping the 8-way mask search saves most of make()
+FONT_SIZE = 80
+TEXT_GAP = 80
+STATUS_GAP = 60
+STATUS_HEIGHT = 140
+STATUS_BORDER = 6
+PREVIEW_SIZES = ((300, 300), (550, 750))  # QR page thumbnail and full-ticket window
+BLACK_THRESHOLD = 128  # gray levels below this are stored as black in 1-bit files
+DETAIL_FONT_SIZE = 44
+DETAIL_GAP = 50
+DETAIL_LINE_HEIGHT = 60
+
+class TicketTemplate:
+    """Preloaded font and blank ticket background shared by every render
+
+    scale shrinks the whole layout, so print sheets draw tickets at their
+    printed size instead of downscaling full-size ones.
+    """
+    def __init__(self, scale=1.0):
+        def scaled(value):
+            return max(1, round(value * scale))
+
+        self.scale = scale
+        self.width = scaled(TICKET_WIDTH)
+        self.height = scaled(TICKET_HEIGHT)
+        self.qr_size = scaled(QR_SIZE)
+        self.qr_x = (self.width - self.qr_size) // 2
+        self.qr_y = scaled(QR_Y)
+        self.font_size = scaled(FONT_SIZE)
+        self.status_height = scaled(STATUS_HEIGHT)
+        self.status_border = scaled(STATUS_BORDER)
+        self.detail_line_height = scaled(DETAIL_LINE_HEIGHT)
+        self.text_y = self.qr_y + self.qr_size + scaled(TEXT_GAP)
+        self.status_xy = (self.qr_x, self.text_y + self.font_size + scaled(STATUS_GAP))
+        self.detail_y = self.status_xy[1] + self.status_height + scaled(DETAIL_GAP)
+
+        from PIL import Image, ImageFont
+
+        try:
+            self.font = ImageFont.truetype("arial.ttf", self.font_size)
+            self.detail_font = ImageFont.truetype("arial.ttf", scaled(DETAIL_FONT_SIZE))
+        except OSError:
+            self.font = ImageFont.load_default(self.font_size)
+            self.detail_font = ImageFont.load_default(scaled(DETAIL_FONT_SIZE))
+
+        # Tickets are pure black on white, so a grayscale canvas is enough
+        self.background = Image.new('L', (self.width, self.height), 255)
+
+        # Payment stamps are overlaid when a ticket is opened, so paying never rewrites the file
+        self.status_stamps = {
+            False: self._make_stamp("NOT PAID"),
+            True: self._make_stamp("PAID"),
+        }
+        self.preview_stamps = {}  # (is_paid, preview size) -> (scaled stamp, position)
+        self._preview_lock = threading.Lock()
+
+    def _make_stamp(self, text):
+        from PIL import Image, ImageDraw
+
+        stamp = Image.new('L', (self.qr_size, self.status_height), 255)
+        draw = ImageDraw.Draw(stamp)
+        draw.rectangle((0, 0, self.qr_size - 1, self.status_height - 1), outline=0, width=self.status_border)
+        draw.text((self.qr_size // 2, self.status_height // 2), text, fill=0, font=self.font, anchor="mm")
+        return stamp
+
+    def render_qr(self, qr_data):
+        """Build the QR symbol with whole-pixel modules at (at most) qr_size"""
+        import qrcode
+        from PIL import Image
+
+
+        qr = qrcode.QRCode(border=QR_BORDER, mask_pattern=QR_MASK_PATTERN)
+        qr.add_data(qr_data)
+        qr.make(fit=True)
+        matrix = qr.get_matrix()
+
+        modules = len(matrix)
+        pixels = bytes(0 if cell else 255 for row in matrix for cell in row)
+        qr_img = Image.frombytes('L', (modules, modules), pixels)
+        box_size = max(1, self.qr_size // modules)
+        return qr_img.resize((modules * box_size, modules * box_size), Image.Resampling.NEAREST)
+
+    def render(self, qr_data, traveler_id, details=()):
+        """Ticket with the QR, the ID line and a few human-readable detail lines"""
+        from PIL import ImageDraw
+
+        ticket = self.background.copy()
+
+        with METRICS.span("render.qr_encode"):
+            qr_img = self.render_qr(qr_data)
+        offset = (self.qr_size - qr_img.width) // 2
+        ticket.paste(qr_img, (self.qr_x + offset, self.qr_y + offset))
+
+        draw = ImageDraw.Draw(ticket)
+        text = f"Traveler ID: {traveler_id}"
+        text_width = draw.textlength(text, font=self.font)
+        text_x = (self.width - int(text_width)) // 2
+        draw.text((text_x, self.text_y), text, fill=0, font=self.font)
+
+        for i, line in enumerate(details):
+            draw.text((self.width // 2, self.detail_y + i * self.detail_line_height), line,
+                      fill=0, font=self.detail_font, anchor="mt")
+        return ticket
+
+    def stamp_status(self, ticket, is_paid):
+        ticket.paste(self.status_stamps[bool(is_paid)], self.status_xy)
+
+    def preview_stamp(self, is_paid, size):
+        """The payment stamp scaled the way a full ticket is scaled to size"""
+        key = (bool(is_paid), size)
+        stamp = self.preview_stamps.get(key)
+        if stamp is None:
+            from PIL import Image
+
+            sx, sy = size[0] / self.width, size[1] / self.height
+            scaled = self.status_stamps[key[0]].resize(
+                (max(1, round(self.qr_size * sx)), max(1, round(self.status_height * sy))), Image.Resampling.LANCZOS)
+            stamp = (scaled, (round(self.status_xy[0] * sx), round(self.status_xy[1] * sy)))
+            with self._preview_lock:
+                self.preview_stamps[key] = stamp
+        return stamp
+
+_ticket_templates = {}  # scale -> TicketTemplate
+_ticket_template_lock = threading.Lock()
+
+def get_ticket_template(scale=1.0):
+    """Return the shared TicketTemplate for a scale, building it on first use"""
+    template = _ticket_templates.get(scale)
+    if template is None:
+        with _ticket_template_lock:
+            template = _ticket_templates.get(scale)
+            if template is None:
+                template = _ticket_templates[scale] = TicketTemplate(scale)
+    return template
+
+def save_ticket(ticket, qr_filename):
+    """Write a ticket compactly: 1-bit PNG, or lossless WebP for .webp names
+
+    The file is written under a temporary name and renamed into place, so
+    readers never see a half-written ticket.
+    """
+    os.makedirs(os.path.dirname(qr_filename) or ".", exist_ok=True)
+    tmp_filename = qr_filename + ".tmp"
+    if qr_filename.endswith(".webp"):
+        ticket.save(tmp_filename, "WEBP", lossless=True)
+    else:
+        ticket.point(lambda v: 255 if v >= BLACK_THRESHOLD else 0).convert("1", dither=0).save(tmp_filename, "PNG")
+    os.replace(tmp_filename, qr_filename)
+
+def make_previews(ticket, sizes):
+    """Unstamped downscaled copies of a ticket, one per (width, height)"""
+    from PIL import Image
+    return {size: ticket.resize(size, Image.Resampling.LANCZOS) for size in sizes}
+
+def stamp_preview(preview, is_paid):
+    """Copy of a preview with its payment stamp overlaid"""
+    stamp, xy = get_ticket_template().preview_stamp(is_paid, preview.size)
+    preview = preview.copy()
+    preview.paste(stamp, xy)
+    return preview
+
+def render_ticket(qr_data, traveler_id, qr_filename, details=(), preview_sizes=()):
+    """Draw the ticket image for qr_data, save it as qr_filename and return its previews
+
+    Previews are scaled from the grayscale drawing, before the 1-bit
+    conversion, so they stay smooth.
+    """
+    with METRICS.span("render.draw"):
+        ticket = get_ticket_template().render(qr_data, traveler_id, details)
+    with METRICS.span("render.save"):
+        save_ticket(ticket, qr_filename)
+    with METRICS.span("render.previews"):
+        return make_previews(ticket, preview_sizes)
+
+def load_ticket(source):
+    """Read a rendered ticket (path or file object) as a grayscale image"""
+    from PIL import Image
+
+    with Image.open(source) as ticket:
+        return ticket.convert("L")
+
+def open_ticket(source, is_paid):
+    """Open a rendered ticket (path or file object) with its current payment stamp overlaid"""
+    ticket = load_ticket(source)
+    get_ticket_template().stamp_status(ticket, is_paid)
+    return ticket
@@ -0,0 +1,194 @@
+"""Revenue totals and streamed manifest exports
+
+    python ferry_reports.py --db ferry_system.db
+    python ferry_reports.py --journal ticket_logs.jsonl --day 2026-10-17
+    python ferry_reports.py --db ferry_system.db --export manifest.csv --destination Tingloy --departure 08:30
+
+Totals come from the running sums TravelerTable keeps (RevenueTotals),
+so a report costs the same for ten travelers or a million. Exports walk
+the table one row at a time and write as they go; Parquet needs pyarrow.
+"""
+import argparse
+import csv
+import json
+import sys
+from ferry_fares import ENVIRONMENTAL_FEE, PWD_DISCOUNT
+from ferry_table import FLAG_LOCAL, FLAG_PAID, FLAG_PWD
+
+# Constants
+MANIFEST_FIELDS = ("traveler_id", "name", "status", "is_local", "is_pwd", "destination", "departure_time",
+                   "fare", "is_paid", "is_boarded", "issued_at", "ticket_version")
+EXPORT_FORMATS = ("csv", "parquet")
+PARQUET_BATCH = 10000  # rows buffered per Parquet row group
+
+def _day_key(day):
+    """'YYYY-MM-DD' -> YYYYMMDD, the day part of a packed issue timestamp"""
+    return int(day.replace("-", ""))
+
+def _day_text(key):
+    return f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}" if key else None
+
+def _fares():
+    return {"travelers": 0, "paid": 0, "unpaid": 0}
+
+def _pesos(value):
+    """Convert centavo counts in a (nested) report dict to pesos"""
+    if isinstance(value, dict):
+        return {k: v if k == "travelers" else _pesos(v) for k, v in value.items()}
+    return value / 100
+
+def revenue_report(system, day=None):
+    """Fare totals split by paid/unpaid, status, destination, environmental fee and PWD discount
+
+    day ("YYYY-MM-DD") limits the report to tickets issued that day.
+    Amounts are in pesos; every "travelers" entry is a head count.
+    """
+    table = system.travelers
+    with table.lock:
+        cells = [(key, count, centavos) for key, (count, centavos) in table.revenue.cells.items() if count]
+    wanted_day = None if day is None else _day_key(day)
+
+    totals = _fares()
+    by_status, by_destination = {}, {}
+    env_fees = {"local": _fares(), "non_local": _fares()}
+    pwd = _fares()
+    days = set()
+    env_centavos = round(ENVIRONMENTAL_FEE * 100)
+    for (day_key, flags, status_code, destination_code), count, centavos in cells:
+        days.add(day_key)
+        if wanted_day is not None and day_key != wanted_day:
+            continue
+        paid = "paid" if flags & FLAG_PAID else "unpaid"
+        status = table.statuses.values[status_code]
+        destination = table.destinations.values[destination_code]
+        env = 0 if flags & FLAG_LOCAL else count * env_centavos
+        for group in (totals, by_status.setdefault(status, _fares()),
+                      by_destination.setdefault(destination, _fares())):
+            group["travelers"] += count
+            group[paid] += centavos
+        fees = env_fees["local" if flags & FLAG_LOCAL else "non_local"]
+        fees["travelers"] += count
+        fees[paid] += env
+        if flags & FLAG_PWD:
+            # The stored fare is the discounted base plus the fee; undo the discount to see what it saved
+            pwd["travelers"] += count
+            pwd[paid] += round((centavos - env) * (1 / PWD_DISCOUNT - 1))
+
+    return {
+        "day": day,
+        "days": [_day_text(key) for key in sorted(days) if key],
+        "fares": _pesos(totals),
+        "by_status": _pesos(by_status),
+        "by_destination": _pesos(by_destination),
+        "environmental_fees": _pesos(env_fees),
+        "pwd_discounts": _pesos(pwd),
+    }
+
+def manifest_rows(system, destination=None, departure_time=None, is_paid=None):
+    """Yield one MANIFEST_FIELDS tuple per matching traveler, without building a list"""
+    if departure_time is not None:
+        sailing = system.get_sailing(destination, departure_time)
+        travelers = (system.travelers[row] for row in list(sailing.rows)) if sailing else ()
+    else:
+        travelers = system.query(destination=destination)
+    for t in travelers:
+        if is_paid is not None and t.is_paid != is_paid:
+            continue
+        yield (t.traveler_id, t.name, t.status, t.is_local, t.is_pwd, t.destination, t.departure_time,
+               t.fare, t.is_paid, t.is_boarded, t.issued_at, t.ticket_version)
+
+def write_csv(rows, f):
+    """Write rows to an open text file as CSV with a header; returns the row count"""
+    writer = csv.writer(f)
+    writer.writerow(MANIFEST_FIELDS)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+def write_parquet(rows, path, batch_size=PARQUET_BATCH):
+    """Write rows to a Parquet file one row group at a time; returns the row count"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow)") from None
+
+    schema = pa.schema([
+        ("traveler_id", pa.int64()), ("name", pa.string()), ("status", pa.string()), ("is_local", pa.bool_()),
+        ("is_pwd", pa.bool_()), ("destination", pa.string()), ("departure_time", pa.string()),
+        ("fare", pa.float64()), ("is_paid", pa.bool_()), ("is_boarded", pa.bool_()),
+        ("issued_at", pa.string()), ("ticket_version", pa.int32()),
+    ])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                writer.write_table(pa.Table.from_pylist([dict(zip(MANIFEST_FIELDS, r)) for r in batch], schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist([dict(zip(MANIFEST_FIELDS, r)) for r in batch], schema))
+            count += len(batch)
+    return count
+
+def export_manifest(system, path, export_format=None, **filters):
+    """Stream matching travelers to a CSV or Parquet file ("-" is CSV on stdout); returns the row count"""
+    if export_format is None:
+        export_format = "parquet" if path.endswith(".parquet") else "csv"
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"export_format must be one of {EXPORT_FORMATS}, not {export_format!r}")
+    rows = manifest_rows(system, **filters)
+    if export_format == "parquet":
+        return write_parquet(rows, path)
+    if path == "-":
+        return write_csv(rows, sys.stdout)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        return write_csv(rows, f)
+
+def main(argv=None):
+    from ferry_core import QR_FOLDER, FerrySystem, open_system
+
+    parser = argparse.ArgumentParser(description="Revenue totals and manifest exports")
+    parser.add_argument("--db", help="SQLite database the travelers are stored in")
+    parser.add_argument("--journal", help="ticket_logs journal file the travelers are stored in")
+    parser.add_argument("--qr-folder", default=QR_FOLDER, help="where ticket images are written")
+    parser.add_argument("--day", help="only tickets issued on this day (YYYY-MM-DD)")
+    parser.add_argument("--export", metavar="FILE", help="write the manifest to a .csv or .parquet file ('-' for stdout)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="export format (default: from extension)")
+    parser.add_argument("--destination", help="export only this destination")
+    parser.add_argument("--departure", help="export only this sailing (needs --destination)")
+    parser.add_argument("--paid", choices=("yes", "no"), help="export only paid or unpaid travelers")
+    args = parser.parse_args(argv)
+    try:
+        args.departure = FerrySystem.normalize_departure(args.departure)
+    except ValueError as e:
+        parser.error(str(e))
+    if not args.db and not args.journal:
+        parser.error("--db or --journal is needed to load the travelers")
+    if args.departure and not args.destination:
+        parser.error("--departure needs --destination")
+
+    system = open_system(args.db, args.journal, qr_folder=args.qr_folder)
+    try:
+        if args.export:
+            is_paid = None if args.paid is None else args.paid == "yes"
+            try:
+                count = export_manifest(system, args.export, args.format, destination=args.destination,
+                                        departure_time=args.departure, is_paid=is_paid)
+            except ImportError as e:
+                print(f"error: {e}", file=sys.stderr)
+                return 2
+            if args.export != "-":
+                print(f"Exported {count} travelers to {args.export}")
+        else:
+            print(json.dumps(revenue_report(system, args.day), indent=2, ensure_ascii=False))
+    finally:
+        system.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
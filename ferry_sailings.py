@@ -0,0 +1,133 @@
+import threading
+from array import array
+
+# Constants
+DEFAULT_CAPACITY = 150  # seats on a sailing nobody has configured yet
+
+class SailingFull(ValueError):
+    pass
+
+class Sailing:
+    """One departure to one destination, with its seat count and manifest rows"""
+    def __init__(self, destination, departure_time, capacity=DEFAULT_CAPACITY):
+        self.destination = destination
+        self.departure_time = departure_time
+        self.capacity = capacity
+        self.rows = array('l')  # TravelerTable rows, in booking order
+
+    def __repr__(self):
+        return f"Sailing({self.destination!r}, {self.departure_time!r}, {len(self.rows)}/{self.capacity})"
+
+    @property
+    def key(self):
+        return (self.destination, self.departure_time)
+
+    @property
+    def booked(self):
+        return len(self.rows)
+
+    @property
+    def seats_left(self):
+        return max(0, self.capacity - len(self.rows))
+
+class SailingSchedule:
+    """Sailings keyed by (destination, departure_time)
+
+    Every seat change happens under one lock, so concurrent counters can
+    never sell the same last seat twice. Manifests are kept as row arrays
+    on each Sailing, so looking one up is a single dict access.
+    """
+    def __init__(self, default_capacity=DEFAULT_CAPACITY):
+        self.default_capacity = default_capacity
+        self.sailings = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.sailings)
+
+    def __iter__(self):
+        with self._lock:
+            sailings = list(self.sailings.values())
+        return iter(sorted(sailings, key=lambda s: (s.departure_time, s.destination)))
+
+    def get(self, destination, departure_time):
+        return self.sailings.get((destination, departure_time))
+
+    def _sailing(self, destination, departure_time):
+        sailing = self.sailings.get((destination, departure_time))
+        if sailing is None:
+            sailing = Sailing(destination, departure_time, self.default_capacity)
+            self.sailings[sailing.key] = sailing
+        return sailing
+
+    def add_sailing(self, destination, departure_time, capacity=None):
+        """Create a sailing or change its capacity; returns the Sailing"""
+        with self._lock:
+            sailing = self._sailing(destination, departure_time)
+            if capacity is not None:
+                sailing.capacity = capacity
+            return sailing
+
+    def reserve(self, destination, departure_time, row):
+        """Book row onto a sailing, or raise SailingFull when no seat is left"""
+        with self._lock:
+            sailing = self._sailing(destination, departure_time)
+            if len(sailing.rows) >= sailing.capacity:
+                raise SailingFull(f"{destination} {departure_time} is full ({sailing.capacity} seats)")
+            sailing.rows.append(row)
+            return sailing
+
+    def move(self, row, old_key, destination, departure_time):
+        """Rebook row from the sailing at old_key; the old seat is kept if the new one is full"""
+        with self._lock:
+            sailing = self._sailing(destination, departure_time)
+            if len(sailing.rows) >= sailing.capacity:
+                raise SailingFull(f"{destination} {departure_time} is full ({sailing.capacity} seats)")
+            self._release(row, old_key)
+            sailing.rows.append(row)
+            return sailing
+
+    def move_many(self, moves):
+        """Rebook several (row, old_key, destination, departure_time) at once, all or nothing
+
+        An old_key of None books a row that had no sailing. SailingFull is
+        raised, and nothing changes, if any target lacks the seats for its rows.
+        """
+        with self._lock:
+            needed = {}
+            for _, old_key, destination, departure_time in moves:
+                key = (destination, departure_time)
+                if key != old_key:
+                    needed[key] = needed.get(key, 0) + 1
+            for (destination, departure_time), count in needed.items():
+                sailing = self._sailing(destination, departure_time)
+                if len(sailing.rows) + count > sailing.capacity:
+                    raise SailingFull(f"{destination} {departure_time} has {sailing.seats_left} seats left, "
+                                      f"{count} needed")
+            for row, old_key, destination, departure_time in moves:
+                if (destination, departure_time) == old_key:
+                    continue
+                if old_key is not None:
+                    self._release(row, old_key)
+                self.sailings[(destination, departure_time)].rows.append(row)
+
+    def restore(self, row, old_key, destination, departure_time):
+        """Put a stored or replayed row on its sailing without checking capacity
+
+        A departure_time of None takes the row off its old sailing only.
+        """
+        with self._lock:
+            if old_key == (destination, departure_time):
+                return self.sailings.get(old_key)
+            if old_key is not None:
+                self._release(row, old_key)
+            if departure_time is None:
+                return None
+            sailing = self._sailing(destination, departure_time)
+            sailing.rows.append(row)
+            return sailing
+
+    def _release(self, row, key):
+        old = self.sailings.get(key)
+        if old is not None and row in old.rows:
+            old.rows.remove(row)
@@ -0,0 +1,215 @@
+"""Search travelers by name or ID as the admin types
+
+Names are split into words and indexed by their leading-anchored
+trigrams, so a query word finds names with a word that starts with it
+(prefix), and, for longer query words, names one or two typos away.
+Matching ignores case and accents. ID queries walk the ID ranges that
+share the typed digits, which needs no index because IDs are integers.
+
+The index follows the traveler table on its own: rows appended since the
+last search are indexed at the start of the next one.
+"""
+import heapq
+import threading
+import unicodedata
+from array import array
+
+# Constants
+SEARCH_LIMIT = 20
+GRAM = 3
+PAD = "$" * (GRAM - 1)  # words are anchored at the start only, so prefixes match
+
+def normalize(text):
+    """Lowercase, accent-free words of text"""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(c if c.isalnum() else " " for c in text if not unicodedata.combining(c))
+    return text.split()
+
+def grams(word):
+    padded = PAD + word
+    return {padded[i:i + GRAM] for i in range(len(word))}
+
+def max_typos(word):
+    """Edits tolerated for a query word; short words must match exactly"""
+    if len(word) <= 3:
+        return 0
+    return 1 if len(word) <= 7 else 2
+
+def swap_variants(word, limit, start=0):
+    """(variant, edits left) for word with up to limit disjoint neighbour swaps, word itself first"""
+    yield word, limit
+    if limit:
+        for i in range(start, len(word) - 1):
+            if word[i] != word[i + 1]:
+                swapped = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+                yield from swap_variants(swapped, limit - 1, i + 2)
+
+def prefix_distance(query, word, limit):
+    """Edits (a swap of neighbours counts as one) from query to the closest prefix of word
+
+    Returns limit + 1 as soon as every alignment is over the limit.
+    """
+    before, previous = None, list(range(len(word) + 1))
+    for i, qc in enumerate(query, 1):
+        current = [i]
+        for j, wc in enumerate(word, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (qc != wc))
+            if i > 1 and j > 1 and qc == word[j - 2] and query[i - 2] == wc:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous)
+
+def prefix_score(query, words):
+    """3 if a word of the name is query, 2 if one starts with it, else 0"""
+    best = 0
+    for word in words:
+        if word == query:
+            return 3
+        if best == 0 and word.startswith(query):
+            best = 2
+    return best
+
+def typo_score(query, words):
+    """Below 1 for a word within query's typo budget (closer is higher), else 0"""
+    limit = max_typos(query)
+    distance = min((prefix_distance(query, word, limit) for word in words), default=limit + 1)
+    return 1 - distance / (limit + 1) if distance <= limit else 0
+
+class SearchIndex:
+    """Trigram index over traveler names, kept in step with a TravelerTable"""
+    def __init__(self, table):
+        self.table = table
+        self.postings = {}  # trigram -> array of rows, one entry per word containing it
+        self.words = []  # row -> normalized name words
+        self.word_rows = {}  # distinct word -> array of rows whose name contains it
+        self.word_postings = {}  # trigram -> distinct words containing it
+        self.max_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.words)
+
+    def catch_up(self):
+        """Index the rows appended to the table since the last call"""
+        table = self.table
+        with self._lock:
+            for row in range(len(self.words), len(table)):
+                words = normalize(table.names[row])
+                self.words.append(words)
+                for word in words:
+                    rows = self.word_rows.get(word)
+                    if rows is None:
+                        rows = self.word_rows[word] = array('l')
+                        for gram in grams(word):
+                            self.word_postings.setdefault(gram, []).append(word)
+                    rows.append(row)
+                    for gram in grams(word):
+                        postings = self.postings.get(gram)
+                        if postings is None:
+                            postings = self.postings[gram] = array('l')
+                        postings.append(row)
+                self.max_id = max(self.max_id, table.ids[row])
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Best matching travelers, best first; digits search IDs, anything else names"""
+        self.catch_up()
+        query = query.strip()
+        if not query:
+            return []
+        if query.isdigit():
+            return [self.table[row] for row in self._id_rows(query, limit)]
+        return [self.table[row] for row in self._name_rows(query, limit)]
+
+    def _id_rows(self, digits, limit):
+        """Rows whose ID starts with digits, shortest (then lowest) ID first"""
+        rows_by_id = self.table.rows_by_id
+        low = int(digits)
+        high = low + 1
+        rows = []
+        while low <= self.max_id and low > 0 and len(rows) < limit:
+            for traveler_id in range(low, min(high, self.max_id + 1)):
+                row = rows_by_id.get(traveler_id)
+                if row is not None:
+                    rows.append(row)
+                    if len(rows) == limit:
+                        break
+            low, high = low * 10, high * 10
+        return rows
+
+    def _rarest(self, word):
+        return min((self.postings.get(gram, ()) for gram in grams(word)), key=len)
+
+    def _prefix_matches(self, query_words, limit):
+        """(score, row) of rows where every query word is a whole word or a word prefix
+
+        Rows are visited newest first and the walk stops once limit rows
+        have the best score the query can get, so common prefixes stay cheap.
+        """
+        driver = min((self._rarest(word) for word in query_words), key=len)
+        ceiling = sum(3 if word in self.word_rows else 2 for word in query_words)
+        words = self.words
+        scored, top, previous = [], 0, None
+        for row in reversed(driver):
+            if row == previous:
+                continue  # the trigram occurs in two words of this name
+            previous = row
+            scores = [prefix_score(word, words[row]) for word in query_words]
+            if all(scores):
+                score = sum(scores)
+                scored.append((score, row))
+                if score == ceiling:
+                    top += 1
+                    if top == limit:
+                        break
+        return scored
+
+    def _close_words(self, word):
+        """{distinct word: score} of the words prefix_distance puts within word's typo budget
+
+        A swap of neighbours is one edit but breaks up to GRAM + 1 trigrams,
+        so every way of swapping is looked up as a variant of its own. Any
+        other edit breaks at most GRAM trigrams, so a word within `edits` of
+        a variant shares all but GRAM * edits of its trigrams and is sure to
+        be in one of its GRAM * edits + 1 rarest posting lists.
+        """
+        limit = max_typos(word)
+        candidates = set()
+        for variant, edits in swap_variants(word, limit):
+            postings = sorted((self.word_postings.get(gram, ()) for gram in grams(variant)), key=len)
+            if len(postings) <= GRAM * edits:
+                candidates = self.word_rows  # too few trigrams to rule anything out
+                break
+            for words in postings[:GRAM * edits + 1]:
+                candidates.update(words)
+        close = {}
+        for candidate in candidates:
+            score = prefix_score(word, [candidate]) or typo_score(word, [candidate])
+            if score:
+                close[candidate] = score
+        return close
+
+    def _name_rows(self, query, limit):
+        query_words = normalize(query)
+        if not query_words:
+            return []
+        scored = self._prefix_matches(query_words, limit)
+        if len(scored) < limit and any(max_typos(word) for word in query_words):
+            # Too few exact prefixes: look for names a typo or two away
+            seen = {row for _, row in scored}
+            close = {word: self._close_words(word) for word in query_words if max_typos(word)}
+            candidate_sets = sorted(({row for found in words for row in self.word_rows[found]}
+                                     for words in close.values()), key=len)
+            candidates = candidate_sets[0].difference(seen)
+            for other in candidate_sets[1:]:
+                candidates.intersection_update(other)
+            for row in candidates:
+                words = self.words[row]
+                scores = [max(close[word].get(found, 0) for found in words) if word in close
+                          else prefix_score(word, words) for word in query_words]
+                if all(scores):
+                    scored.append((sum(scores), row))
+        # Newer registrations win ties: they are the ones standing at the counter
+        return [row for _, row in heapq.nlargest(limit, scored)]
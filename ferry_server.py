@@ -0,0 +1,331 @@
+"""Local HTTP API so kiosks and the pier tablet can share one FerrySystem
+
+    python ferry_server.py --db ferry_system.db --journal ticket_logs.jsonl
+    python ferry_server.py --port 8765 --departure 08:30
+
+Endpoints (JSON in and out, HTTP/1.1 keep-alive):
+
+    POST /travelers                          register one booking, or a list of them
+    GET  /travelers/<id>                     traveler details
+    POST /travelers/<id>/pay                 {"departure_time": "HH:MM"} is optional
+    POST /travelers/pay                      {"traveler_ids": [...], "departure_time": ...}, all or nothing
+    POST /travelers/reissue                  {"traveler_ids": [...], "departure_time": ...}, new QR codes
+    GET  /travelers/<id>/ticket.png          ticket image with its payment stamp
+    GET  /sailings/<destination>/<HH:MM>     seats and manifest
+    GET  /search/<name or ID prefix>         best matching travelers, typos allowed
+    POST /board                              {"payload": "<scanned QR text>"}
+    GET  /reports/revenue[/<YYYY-MM-DD>]     fare totals, optionally for one issue day
+    GET  /metrics                            timing histograms and counters (with --metrics)
+"""
+import argparse
+import asyncio
+import io
+import json
+import re
+import sys
+from urllib.parse import unquote
+from ferry_batch import clean_booking
+from ferry_boarding import BoardingValidator
+from ferry_assets import TICKET_FORMATS, TicketAssets
+from ferry_core import QR_FOLDER, FerrySystem, SailingFull, open_system
+from ferry_metrics import METRICS
+from ferry_reports import revenue_report
+
+# Constants
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_BODY = 1 << 20
+MAX_HEADER_LINES = 100
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+ROUTES = [
+    ("POST", re.compile(r"/travelers"), "register"),
+    ("GET", re.compile(r"/travelers/(\d+)"), "lookup"),
+    ("POST", re.compile(r"/travelers/(\d+)/pay"), "pay"),
+    ("POST", re.compile(r"/travelers/pay"), "pay_many"),
+    ("POST", re.compile(r"/travelers/reissue"), "reissue"),
+    ("GET", re.compile(r"/travelers/(\d+)/ticket\.png"), "ticket"),
+    ("GET", re.compile(r"/sailings/([^/]+)/(\d{1,2}:\d{2})"), "manifest"),
+    ("POST", re.compile(r"/board"), "board"),
+    ("GET", re.compile(r"/search/([^/]+)"), "search"),
+    ("GET", re.compile(r"/reports/revenue(?:/(\d{4}-\d{2}-\d{2}))?"), "revenue"),
+    ("GET", re.compile(r"/metrics"), "metrics"),
+]
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _ticket_png(system, traveler_id):
+    """Stamped ticket encoded as PNG bytes; runs on an executor thread"""
+    buffer = io.BytesIO()
+    system.open_ticket(traveler_id).save(buffer, "PNG")
+    return buffer.getvalue()
+
+class FerryServer:
+    """asyncio HTTP front end for one FerrySystem
+
+    FerrySystem calls are short and thread-safe, so they run on the event
+    loop; ticket rendering already happens on the system's render pool,
+    and encoding a stamped image for download goes to the default executor.
+    """
+    def __init__(self, system, host=HOST, port=PORT):
+        self.system = system
+        self.host = host
+        self.port = port
+        self.validator = BoardingValidator(system)
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    # The stream position is unknown after a malformed request, so close
+                    self._write_response(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                status, payload = await self.dispatch(method, path, body)
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        """Return (method, path, body, keep_alive), or None when the client hung up"""
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(400, "malformed request line") from None
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HTTPError(400, "too many headers")
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "bad Content-Length") from None
+        if length > MAX_BODY:
+            raise HTTPError(413, f"body larger than {MAX_BODY} bytes")
+        body = await reader.readexactly(length) if length else b""
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method.upper(), unquote(target.split("?", 1)[0]), body, keep_alive
+
+    def _write_response(self, writer, status, payload, keep_alive):
+        if isinstance(payload, bytes):
+            content_type, body = "image/png", payload
+        elif isinstance(payload, str):
+            content_type, body = "text/plain; version=0.0.4", payload.encode()
+        else:
+            content_type, body = "application/json", json.dumps(payload, ensure_ascii=False).encode()
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+
+    async def dispatch(self, method, path, body):
+        """Route one request; returns (status, JSON-able payload, PNG bytes or plain text)"""
+        allowed = False
+        for route_method, pattern, name in ROUTES:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            try:
+                data = json.loads(body) if body else None
+                return await getattr(self, "handle_" + name)(data, *match.groups())
+            except HTTPError as e:
+                return e.status, {"error": str(e)}
+            except json.JSONDecodeError as e:
+                return 400, {"error": f"invalid JSON: {e}"}
+            except Exception as e:
+                return 500, {"error": f"{type(e).__name__}: {e}"}
+        if allowed:
+            return 405, {"error": f"{method} not allowed on {path}"}
+        return 404, {"error": f"no route for {path}"}
+
+    def _traveler(self, traveler_id):
+        t = self.system.get_traveler(traveler_id)
+        if t is None:
+            raise HTTPError(404, f"traveler {traveler_id} not found")
+        return t
+
+    def _register_one(self, booking, index):
+        try:
+            fields = clean_booking(booking, index)
+        except (ValueError, TypeError, AttributeError) as e:
+            raise HTTPError(400, str(e)) from None
+        if fields["departure_time"] is None:
+            fields["departure_time"] = self.system.departure_time
+        try:
+            traveler_id, qr_filename = self.system.register_traveler(**fields)
+        except SailingFull as e:
+            raise HTTPError(409, str(e)) from None
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+        return {"traveler_id": traveler_id, "qr_filename": qr_filename}
+
+    async def handle_register(self, data):
+        # A list registers a whole group in one round trip; each booking succeeds or fails on its own
+        if isinstance(data, list):
+            results = []
+            for index, booking in enumerate(data, start=1):
+                try:
+                    results.append(self._register_one(booking, index))
+                except HTTPError as e:
+                    results.append({"error": str(e), "status": e.status})
+            return 200, results
+        if not isinstance(data, dict):
+            raise HTTPError(400, "expected a booking object or a list of them")
+        return 201, self._register_one(data, 1)
+
+    async def handle_lookup(self, data, traveler_id):
+        return 200, self._traveler(traveler_id).to_dict()
+
+    async def handle_pay(self, data, traveler_id):
+        t = self._traveler(traveler_id)
+        departure_time = (data or {}).get("departure_time")
+        try:
+            self.system.mark_as_paid(t.traveler_id, departure_time)
+        except SailingFull as e:
+            raise HTTPError(409, str(e)) from None
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+        return 200, t.to_dict()
+
+    def _bulk(self, method, data):
+        if not isinstance(data, dict) or not isinstance(data.get("traveler_ids"), list):
+            raise HTTPError(400, "expected {\"traveler_ids\": [...]}")
+        try:
+            return method(data["traveler_ids"], data.get("departure_time"))
+        except KeyError as e:
+            raise HTTPError(404, e.args[0]) from None
+        except SailingFull as e:
+            raise HTTPError(409, str(e)) from None
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+
+    async def handle_pay_many(self, data):
+        return 200, {"changed": self._bulk(self.system.mark_many_paid, data)}
+
+    async def handle_reissue(self, data):
+        jobs = self._bulk(self.system.reissue_tickets, data)
+        return 200, {"reissued": len(jobs)}
+
+    async def handle_ticket(self, data, traveler_id):
+        t = self._traveler(traveler_id)
+        job = self.system.ensure_ticket(t.traveler_id)
+        if job is not None:
+            await asyncio.wrap_future(job)
+        loop = asyncio.get_running_loop()
+        return 200, await loop.run_in_executor(None, _ticket_png, self.system, t.traveler_id)
+
+    async def handle_manifest(self, data, destination, departure_time):
+        try:
+            sailing = self.system.get_sailing(destination.title(), departure_time)
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+        if sailing is None:
+            raise HTTPError(404, f"no sailing to {destination} at {departure_time}")
+        return 200, {
+            "destination": sailing.destination,
+            "departure_time": sailing.departure_time,
+            "capacity": sailing.capacity,
+            "seats_left": sailing.seats_left,
+            "travelers": [t.to_dict() for t in self.system.get_manifest(*sailing.key)],
+        }
+
+    async def handle_search(self, data, query):
+        return 200, [t.to_dict() for t in self.system.search(query)]
+
+    async def handle_board(self, data):
+        if not isinstance(data, dict) or "payload" not in data:
+            raise HTTPError(400, "expected {\"payload\": ...}")
+        result = self.validator.validate(str(data["payload"]))
+        return 200, result._asdict()
+
+    async def handle_revenue(self, data, day=None):
+        return 200, revenue_report(self.system, day)
+
+    async def handle_metrics(self, data):
+        # Prometheus text format, so a scraper can read it as is
+        if not METRICS.enabled:
+            raise HTTPError(404, "metrics are off; start the server with --metrics")
+        return 200, METRICS.render_text()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the ferry system to kiosks over local HTTP")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--db", help="SQLite database to persist travelers in")
+    parser.add_argument("--journal", help="ticket_logs journal file to append to")
+    parser.add_argument("--qr-folder", default=QR_FOLDER, help="where ticket images are written")
+    parser.add_argument("--ticket-format", choices=TICKET_FORMATS, default="png", help="ticket image format")
+    parser.add_argument("--lazy-tickets", action="store_true", help="draw tickets on first download, not at registration")
+    parser.add_argument("--departure", help="departure time (HH:MM) for bookings without one")
+    parser.add_argument("--summer", action="store_true",
+                        help="switch to summer fares, repricing unpaid tickets (without it the saved season is kept)")
+    parser.add_argument("--metrics", action="store_true", help="record timings and serve them at /metrics")
+    args = parser.parse_args(argv)
+    try:
+        args.departure = FerrySystem.normalize_departure(args.departure)
+    except ValueError as e:
+        parser.error(str(e))
+
+    METRICS.configure_from_env()
+    if args.metrics:
+        METRICS.enable()
+
+    assets = TicketAssets(args.qr_folder, args.ticket_format, eager=not args.lazy_tickets)
+    system = open_system(args.db, args.journal, qr_folder=args.qr_folder, assets=assets)
+    if args.summer:
+        system.set_summer(True)
+    if args.departure:
+        system.set_departure_time(args.departure)
+
+    server = FerryServer(system, args.host, args.port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        system.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Constants
+DB_FILE = "ferry_system.db"
+POOL_SIZE = 4
+BATCH_SIZE = 200
+FLUSH_INTERVAL = 0.2  # seconds a write may sit in the batch before commit
+
+# SQLite dialect of ferry_system.sql
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    traveler_id INTEGER PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    is_local TINYINT(1) NOT NULL,
+    is_pwd TINYINT(1) NOT NULL,
+    destination VARCHAR(100) NOT NULL,
+    fare DECIMAL(10,2) NOT NULL,
+    qr_filename VARCHAR(500) NOT NULL,
+    is_paid TINYINT(1) NOT NULL DEFAULT 0,
+    departure_time VARCHAR(5),
+    issued_at DATETIME,
+    ticket_version INT NOT NULL DEFAULT 1,
+    is_boarded TINYINT(1) NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS sailings (
+    destination VARCHAR(100) NOT NULL,
+    departure_time VARCHAR(5) NOT NULL,
+    capacity INT NOT NULL,
+    PRIMARY KEY (destination, departure_time)
+);
+
+CREATE TABLE IF NOT EXISTS ticket_logs (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    traveler_id INT NOT NULL,
+    action VARCHAR(255) NOT NULL,
+    timestamp DATETIME NOT NULL,
+    details TEXT,
+
+    CONSTRAINT fk_traveler
+    FOREIGN KEY (traveler_id) REFERENCES users(traveler_id)
+        ON UPDATE CASCADE
+        ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS settings (
+    name VARCHAR(100) PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+USER_COLUMNS = ("traveler_id", "name", "status", "is_local", "is_pwd", "destination",
+                "fare", "qr_filename", "is_paid", "departure_time", "issued_at", "ticket_version", "is_boarded")
+
+# Columns added after the first release, with their definitions for ALTER TABLE
+ADDED_USER_COLUMNS = {
+    "departure_time": "VARCHAR(5)",
+    "issued_at": "DATETIME",
+    "ticket_version": "INT NOT NULL DEFAULT 1",
+    "is_boarded": "TINYINT(1) NOT NULL DEFAULT 0",
+}
+
+# Statements are kept as constants so each pooled connection's statement cache reuses them
+UPSERT_USER = (
+    f"INSERT INTO users ({', '.join(USER_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in USER_COLUMNS)}) "
+    f"ON CONFLICT(traveler_id) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in USER_COLUMNS[1:])
+)
+UPDATE_PAID = "UPDATE users SET is_paid = ? WHERE traveler_id = ?"
+UPDATE_FARE = "UPDATE users SET fare = ? WHERE traveler_id = ?"
+UPDATE_BOARDED = "UPDATE users SET is_boarded = 1 WHERE traveler_id = ?"
+INSERT_LOG = "INSERT INTO ticket_logs (traveler_id, action, timestamp, details) VALUES (?, ?, ?, ?)"
+SELECT_USERS = f"SELECT {', '.join(USER_COLUMNS)} FROM users ORDER BY traveler_id"
+UPSERT_SAILING = (
+    "INSERT INTO sailings (destination, departure_time, capacity) VALUES (?, ?, ?) "
+    "ON CONFLICT(destination, departure_time) DO UPDATE SET capacity = excluded.capacity"
+)
+SELECT_SAILINGS = "SELECT destination, departure_time, capacity FROM sailings ORDER BY departure_time, destination"
+UPSERT_SETTING = "INSERT INTO settings (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = excluded.value"
+SELECT_SETTINGS = "SELECT name, value FROM settings"
+SELECT_LOGS = "SELECT log_id, traveler_id, action, timestamp, details FROM ticket_logs WHERE log_id > ? ORDER BY log_id"
+
+def traveler_row(t):
+    """Flatten a Traveler into a users row"""
+    return (t.traveler_id, t.name, t.status, int(bool(t.is_local)), int(bool(t.is_pwd)), t.destination,
+            round(t.fare, 2), t.qr_filename, int(bool(t.is_paid)), t.departure_time, t.issued_at,
+            t.ticket_version, int(bool(t.is_boarded)))
+
+class TicketStore:
+    """Persistence interface behind FerrySystem; the base class keeps nothing"""
+    def load_travelers(self):
+        """Return the stored users rows as dicts, in ID order"""
+        return []
+
+    def load_sailings(self):
+        """Return the configured sailings as dicts"""
+        return []
+
+    def load_settings(self):
+        """Return system-wide settings (such as is_summer) as a dict"""
+        return {}
+
+    def save_traveler(self, t):
+        pass
+
+    def save_sailing(self, sailing):
+        pass
+
+    def save_setting(self, name, value):
+        pass
+
+    def update_paid(self, traveler_id, is_paid):
+        pass
+
+    def update_fare(self, traveler_id, fare):
+        pass
+
+    def mark_boarded(self, traveler_id):
+        pass
+
+    def append_logs(self, entries):
+        """Queue (traveler_id, action, timestamp, details) rows for ticket_logs"""
+        pass
+
+    def load_logs(self, after_log_id=0):
+        return []
+
+    @contextmanager
+    def transaction(self):
+        """Writes made inside the block are committed together"""
+        yield
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class ConnectionPool:
+    """Fixed set of SQLite connections shared between threads"""
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self._idle = queue.LifoQueue()
+        self._connections = [self._connect() for _ in range(size)]
+        for conn in self._connections:
+            self._idle.put(conn)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None,
+                               cached_statements=64)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        for conn in self._connections:
+            conn.close()
+
+class SQLiteStore(TicketStore):
+    """WAL-mode SQLite store that commits writes in batches
+
+    Writes are queued and committed in one transaction once BATCH_SIZE
+    statements are pending or FLUSH_INTERVAL has passed, whichever is first.
+    A crash can lose at most that last unflushed batch.
+    """
+    def __init__(self, path=DB_FILE, pool_size=POOL_SIZE, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.pool = ConnectionPool(path, pool_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(users)")}
+            for column, definition in ADDED_USER_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE users ADD COLUMN {column} {definition}")
+
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self.last_error = None
+        self._flusher = threading.Thread(target=self._flush_loop, name="store-flush", daemon=True)
+        self._flusher.start()
+
+    def load_travelers(self):
+        with self.pool.connection() as conn:
+            rows = conn.execute(SELECT_USERS).fetchall()
+        travelers = []
+        for row in rows:
+            data = dict(zip(USER_COLUMNS, row))
+            data["is_local"] = bool(data["is_local"])
+            data["is_pwd"] = bool(data["is_pwd"])
+            data["is_paid"] = bool(data["is_paid"])
+            data["is_boarded"] = bool(data["is_boarded"])
+            data["fare"] = float(data["fare"])
+            travelers.append(data)
+        return travelers
+
+    def load_sailings(self):
+        with self.pool.connection() as conn:
+            rows = conn.execute(SELECT_SAILINGS).fetchall()
+        return [dict(zip(("destination", "departure_time", "capacity"), row)) for row in rows]
+
+    def load_settings(self):
+        with self.pool.connection() as conn:
+            rows = conn.execute(SELECT_SETTINGS).fetchall()
+        return {name: json.loads(value) for name, value in rows}
+
+    def load_logs(self, after_log_id=0):
+        self.flush()
+        with self.pool.connection() as conn:
+            return conn.execute(SELECT_LOGS, (after_log_id,)).fetchall()
+
+    def save_traveler(self, t):
+        self._enqueue(UPSERT_USER, traveler_row(t))
+
+    def save_sailing(self, sailing):
+        self._enqueue(UPSERT_SAILING, (sailing.destination, sailing.departure_time, sailing.capacity))
+
+    def save_setting(self, name, value):
+        self._enqueue(UPSERT_SETTING, (name, json.dumps(value)))
+
+    def update_paid(self, traveler_id, is_paid):
+        self._enqueue(UPDATE_PAID, (int(bool(is_paid)), traveler_id))
+
+    def update_fare(self, traveler_id, fare):
+        self._enqueue(UPDATE_FARE, (round(fare, 2), traveler_id))
+
+    def mark_boarded(self, traveler_id):
+        self._enqueue(UPDATE_BOARDED, (traveler_id,))
+
+    def append_logs(self, entries):
+        for entry in entries:
+            self._enqueue(INSERT_LOG, tuple(entry))
+
+    @contextmanager
+    def transaction(self):
+        """Hold back the background flush so every write in the block lands in one commit
+
+        Do not call flush() inside the block; it would wait for the block to end.
+        """
+        with self._flush_lock:
+            yield
+        self.flush()
+
+    def _enqueue(self, sql, params):
+        with self._pending_lock:
+            self._pending.append((sql, params))
+            if len(self._pending) >= self.batch_size:
+                self._wakeup.set()
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                # The batch was put back; keep retrying and let callers inspect the error
+                self.last_error = e
+
+    def flush(self):
+        """Commit every pending write in a single transaction"""
+        with self._flush_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+
+            with self.pool.connection() as conn:
+                conn.execute("BEGIN")
+                try:
+                    # Group consecutive runs of the same statement into executemany
+                    start = 0
+                    while start < len(batch):
+                        sql = batch[start][0]
+                        end = start
+                        while end < len(batch) and batch[end][0] == sql:
+                            end += 1
+                        conn.executemany(sql, [params for _, params in batch[start:end]])
+                        start = end
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    with self._pending_lock:
+                        self._pending[:0] = batch
+                    raise
+                conn.execute("COMMIT")
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+        self._flusher.join()
+        self.flush()
+        self.pool.close()
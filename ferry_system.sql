@@ -7,7 +7,20 @@ CREATE TABLE users (
     destination VARCHAR(100) NOT NULL,
     fare DECIMAL(10,2) NOT NULL,
     qr_filename VARCHAR(500) NOT NULL,
-    is_paid TINYINT(1) NOT NULL DEFAULT 0
+    is_paid TINYINT(1) NOT NULL DEFAULT 0,
+    departure_time VARCHAR(5),
+    issued_at DATETIME,
+    ticket_version INT NOT NULL DEFAULT 1,
+    is_boarded TINYINT(1) NOT NULL DEFAULT 0,
+    INDEX idx_sailing (destination, departure_time)
+);
+
+
+CREATE TABLE sailings (
+    destination VARCHAR(100) NOT NULL,
+    departure_time VARCHAR(5) NOT NULL,
+    capacity INT NOT NULL,
+    PRIMARY KEY (destination, departure_time)
 );
 
 
@@ -23,4 +36,10 @@ CREATE TABLE ticket_logs (
         ON UPDATE CASCADE 
         ON DELETE CASCADE
 );
+
+
+CREATE TABLE settings (
+    name VARCHAR(100) PRIMARY KEY,
+    value TEXT NOT NULL
+);
     
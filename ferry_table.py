@@ -0,0 +1,367 @@
+import os
+import threading
+from array import array
+
+# Bits in TravelerTable.flags
+FLAG_LOCAL = 1
+FLAG_PWD = 2
+FLAG_PAID = 4
+FLAG_BOARDED = 8
+REVENUE_FLAGS = FLAG_LOCAL | FLAG_PWD | FLAG_PAID  # the bits RevenueTotals groups by
+
+def pack_timestamp(text):
+    """'YYYY-MM-DD HH:MM:SS' -> YYYYMMDDHHMMSS as one integer (0 for None)"""
+    if not text:
+        return 0
+    return int(text.replace("-", "").replace(" ", "").replace(":", ""))
+
+def unpack_timestamp(value):
+    if not value:
+        return None
+    return (f"{value // 10**10:04d}-{value // 10**8 % 100:02d}-{value // 10**6 % 100:02d} "
+            f"{value // 10**4 % 100:02d}:{value // 100 % 100:02d}:{value % 100:02d}")
+
+def ticket_basename(traveler_id, extension=".png"):
+    return f"traveler_{traveler_id}_ticket{extension}"
+
+class RevenueTotals:
+    """Running fare sums in whole centavos: overall by paid bit, and per report cell
+
+    TravelerTable moves a row between sums on every write that changes its
+    fare, paid bit or grouping. The dashboard reads the two paid/unpaid
+    sums; revenue reports walk the cells, one per (issue day, flags,
+    status, destination) in use, never the rows.
+    """
+    def __init__(self):
+        self.cells = {}  # (YYYYMMDD, flags & REVENUE_FLAGS, status code, destination code) -> [travelers, centavos]
+        self.by_paid = [0, 0]  # centavos of [unpaid, paid] rows
+
+    def add(self, key, fare, sign=1):
+        centavos = sign * round(fare * 100)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = [0, 0]
+        cell[0] += sign
+        cell[1] += centavos
+        self.by_paid[bool(key[1] & FLAG_PAID)] += centavos
+
+    def centavos(self, is_paid=None):
+        if is_paid is None:
+            return self.by_paid[0] + self.by_paid[1]
+        return self.by_paid[bool(is_paid)]
+
+class Interner:
+    """Maps repeated strings (statuses, destinations, ...) to small integer codes; 0 is None"""
+    def __init__(self):
+        self.values = [None]
+        self.codes = {None: 0}
+        self._lock = threading.Lock()
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self.codes.get(value)
+                if code is None:
+                    # values first, so a reader holding the code can always resolve it
+                    code = len(self.values)
+                    self.values.append(value)
+                    self.codes[value] = code
+        return code
+
+class Traveler:
+    """Row view into a TravelerTable; attribute reads and writes go to the columns"""
+    __slots__ = ("table", "row")
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    def __repr__(self):
+        return f"Traveler({self.traveler_id}, {self.name!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Traveler) and other.table is self.table and other.row == self.row
+
+    def __hash__(self):
+        return hash((id(self.table), self.row))
+
+    @property
+    def traveler_id(self):
+        return self.table.ids[self.row]
+
+    @property
+    def name(self):
+        return self.table.names[self.row]
+
+    @property
+    def status(self):
+        return self.table.statuses.values[self.table.status_codes[self.row]]
+
+    @property
+    def destination(self):
+        return self.table.destinations.values[self.table.destination_codes[self.row]]
+
+    @property
+    def fare(self):
+        return self.table.fares[self.row]
+
+    @fare.setter
+    def fare(self, value):
+        self.table.set_fare(self.row, value)
+
+    @property
+    def is_local(self):
+        return bool(self.table.flags[self.row] & FLAG_LOCAL)
+
+    @property
+    def is_pwd(self):
+        return bool(self.table.flags[self.row] & FLAG_PWD)
+
+    @property
+    def is_paid(self):
+        return bool(self.table.flags[self.row] & FLAG_PAID)
+
+    @is_paid.setter
+    def is_paid(self, value):
+        self.table.set_paid(self.row, value)
+
+    @property
+    def departure_time(self):
+        return self.table.departures.values[self.table.departure_codes[self.row]]
+
+    @departure_time.setter
+    def departure_time(self, value):
+        self.table.departure_codes[self.row] = self.table.departures.code(value)
+
+    @property
+    def issued_at(self):
+        return unpack_timestamp(self.table.issued[self.row])
+
+    @property
+    def is_boarded(self):
+        return bool(self.table.flags[self.row] & FLAG_BOARDED)
+
+    @property
+    def ticket_version(self):
+        return self.table.versions[self.row]
+
+    @ticket_version.setter
+    def ticket_version(self, value):
+        self.table.versions[self.row] = value
+
+    @property
+    def qr_filename(self):
+        return self.table.qr_filename(self.row)
+
+    def to_dict(self):
+        return {
+            "traveler_id": self.traveler_id,
+            "name": self.name,
+            "status": self.status,
+            "is_local": self.is_local,
+            "destination": self.destination,
+            "fare": self.fare,
+            "qr_filename": self.qr_filename,
+            "is_paid": self.is_paid,
+            "is_pwd": self.is_pwd,
+            "departure_time": self.departure_time,
+            "issued_at": self.issued_at,
+            "ticket_version": self.ticket_version,
+            "is_boarded": self.is_boarded
+        }
+
+class TravelerTable:
+    """Columnar traveler storage
+
+    One typed array per field: interned codes for status, destination and
+    departure, a float fare column, packed is_local/is_pwd/is_paid bits and
+    integer issue timestamps. Ticket filenames are derived from the ID and
+    an interned folder. Secondary indexes hold row numbers, not objects.
+
+    Writers serialize on self.lock. Readers take no lock: the ids column is
+    appended last, so len(table) only ever counts fully written rows.
+    """
+    def __init__(self):
+        self.ids = array('q')
+        self.names = []
+        self.status_codes = array('H')
+        self.destination_codes = array('H')
+        self.departure_codes = array('H')
+        self.folder_codes = array('H')
+        self.fares = array('d')
+        self.flags = array('B')
+        self.issued = array('q')
+        self.versions = array('H')
+
+        self.statuses = Interner()
+        self.destinations = Interner()
+        self.departures = Interner()
+        self.folders = Interner()
+        self.filename_overrides = {}
+        self.ticket_ext = ".png"
+
+        # Lookup indexes
+        self.rows_by_id = {}
+        self.by_destination = {}  # lowercased destination -> array of rows
+        self.by_status = {}
+        self.paid_count = 0
+        self.revenue = RevenueTotals()
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return (Traveler(self, row) for row in range(len(self.ids)))
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self.ids)
+        if not 0 <= row < len(self.ids):
+            raise IndexError(row)
+        return Traveler(self, row)
+
+    def get(self, traveler_id):
+        row = self.rows_by_id.get(traveler_id)
+        return None if row is None else Traveler(self, row)
+
+    def qr_filename(self, row):
+        override = self.filename_overrides.get(row)
+        if override is not None:
+            return override
+        return os.path.join(self.folders.values[self.folder_codes[row]],
+                            ticket_basename(self.ids[row], self.ticket_ext))
+
+    def _pack_flags(self, fields):
+        return ((FLAG_LOCAL if fields["is_local"] else 0) | (FLAG_PWD if fields.get("is_pwd") else 0)
+                | (FLAG_PAID if fields.get("is_paid") else 0) | (FLAG_BOARDED if fields.get("is_boarded") else 0))
+
+    def _set_filename(self, row, traveler_id, qr_filename):
+        folder, basename = os.path.split(qr_filename)
+        if basename == ticket_basename(traveler_id, self.ticket_ext):
+            self.folder_codes[row] = self.folders.code(folder)
+            self.filename_overrides.pop(row, None)
+        else:
+            self.folder_codes[row] = 0
+            self.filename_overrides[row] = qr_filename
+
+    def _index_row(self, row):
+        self.by_destination.setdefault(self.destinations.values[self.destination_codes[row]].lower(),
+                                       array('l')).append(row)
+        self.by_status.setdefault(self.statuses.values[self.status_codes[row]].lower(), array('l')).append(row)
+
+    def _unindex_row(self, row):
+        self.by_destination[self.destinations.values[self.destination_codes[row]].lower()].remove(row)
+        self.by_status[self.statuses.values[self.status_codes[row]].lower()].remove(row)
+
+    def _count_revenue(self, row, sign):
+        key = (self.issued[row] // 10**6, self.flags[row] & REVENUE_FLAGS,
+               self.status_codes[row], self.destination_codes[row])
+        self.revenue.add(key, self.fares[row], sign)
+
+    def append(self, fields):
+        """Add a traveler from a to_dict()-shaped mapping and return its row view"""
+        traveler_id = fields["traveler_id"]
+        flags = self._pack_flags(fields)
+        with self.lock:
+            row = len(self.ids)
+            self.names.append(fields["name"])
+            self.status_codes.append(self.statuses.code(fields["status"]))
+            self.destination_codes.append(self.destinations.code(fields["destination"]))
+            self.departure_codes.append(self.departures.code(fields.get("departure_time")))
+            self.folder_codes.append(0)
+            self.fares.append(fields["fare"])
+            self.flags.append(flags)
+            self.issued.append(pack_timestamp(fields.get("issued_at")))
+            self.versions.append(fields.get("ticket_version") or 1)
+            self._set_filename(row, traveler_id, fields["qr_filename"])
+            self.ids.append(traveler_id)
+
+            self.rows_by_id[traveler_id] = row
+            self._index_row(row)
+            self._count_revenue(row, 1)
+            if flags & FLAG_PAID:
+                self.paid_count += 1
+        return Traveler(self, row)
+
+    def update(self, row, fields):
+        """Overwrite a row from a to_dict()-shaped mapping"""
+        with self.lock:
+            self.set_paid(row, fields.get("is_paid", False))
+            self._unindex_row(row)
+            self._count_revenue(row, -1)
+            self.names[row] = fields["name"]
+            self.status_codes[row] = self.statuses.code(fields["status"])
+            self.destination_codes[row] = self.destinations.code(fields["destination"])
+            self.departure_codes[row] = self.departures.code(fields.get("departure_time"))
+            self.fares[row] = fields["fare"]
+            self.flags[row] = self._pack_flags(fields)
+            self.issued[row] = pack_timestamp(fields.get("issued_at"))
+            self.versions[row] = fields.get("ticket_version") or 1
+            self._set_filename(row, self.ids[row], fields["qr_filename"])
+            self._index_row(row)
+            self._count_revenue(row, 1)
+        return Traveler(self, row)
+
+    def set_paid(self, row, is_paid):
+        with self.lock:
+            was_paid = bool(self.flags[row] & FLAG_PAID)
+            if was_paid == bool(is_paid):
+                return
+            self._count_revenue(row, -1)
+            if is_paid:
+                self.flags[row] |= FLAG_PAID
+                self.paid_count += 1
+            else:
+                self.flags[row] &= ~FLAG_PAID
+                self.paid_count -= 1
+            self._count_revenue(row, 1)
+
+    def set_fare(self, row, fare):
+        with self.lock:
+            self._count_revenue(row, -1)
+            self.fares[row] = fare
+            self._count_revenue(row, 1)
+
+    def set_boarded(self, row):
+        """Set the boarded bit; False if it was already set"""
+        with self.lock:
+            if self.flags[row] & FLAG_BOARDED:
+                return False
+            self.flags[row] |= FLAG_BOARDED
+            return True
+
+    def find(self, destination=None, status=None, is_paid=None):
+        """Iterate row views matching every given filter, in registration order"""
+        buckets = []
+        if destination is not None:
+            buckets.append(self.by_destination.get(destination.lower(), ()))
+        if status is not None:
+            buckets.append(self.by_status.get(status.lower(), ()))
+
+        if buckets:
+            # Walk the smallest index bucket and check the other filters on the columns
+            buckets.sort(key=len)
+            rows = buckets[0]
+            others = [set(b) for b in buckets[1:]]
+        else:
+            rows = range(len(self.ids))
+            others = []
+
+        flags = self.flags
+        for row in rows:
+            if is_paid is not None and bool(flags[row] & FLAG_PAID) != bool(is_paid):
+                continue
+            if all(row in other for other in others):
+                yield Traveler(self, row)
+
+    def count(self, is_paid=None):
+        if is_paid is None:
+            return len(self.ids)
+        return self.paid_count if is_paid else len(self.ids) - self.paid_count
+
+    def total_fare(self, is_paid=None):
+        """Sum of fares, optionally only paid or unpaid rows; O(1), read from the running totals"""
+        with self.lock:
+            return self.revenue.centavos(is_paid) / 100
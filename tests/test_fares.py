@@ -0,0 +1,81 @@
+"""FareTable must price exactly like the original step-by-step fare rules
+
+The rules are copied below from the original FerrySystem rather than
+taken from ferry_fares, so a change there cannot change the expectation too.
+
+    python -m pytest tests
+"""
+import itertools
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ferry_core import STATUSES
+from ferry_fares import BASE_FARES, FARES, reference_price
+from ferry_table import FLAG_BOARDED, FLAG_LOCAL, FLAG_PAID, FLAG_PWD
+
+# Every status the app offers, the fare table's own keys, odd casing and one it has never heard of
+ALL_STATUSES = sorted(set(STATUSES) | set(BASE_FARES) | {"REGULAR", "sEnIoR", "Crew"})
+OTHER_FLAGS = (0, FLAG_PAID, FLAG_BOARDED, FLAG_PAID | FLAG_BOARDED)
+
+def baseline_fare(status, is_local, is_pwd, is_summer):
+    """(base, env, total) the way calculate_fare_by_status and register_traveler computed them"""
+    status = status.lower()
+    if status == "senior":
+        fare = 104.00
+    elif status == "student":
+        fare = 116.00
+    elif status == "child":
+        fare = 72.00
+    elif status == "infant":
+        fare = 0.00
+    else:
+        fare = 160.00
+
+    if is_summer:
+        fare *= 0.90
+
+    base_fare = fare
+    env_fee = 0.00 if is_local else 50.00
+    if is_pwd:
+        base_fare = base_fare * 0.80
+    return base_fare, env_fee, base_fare + env_fee
+
+def flags_for(is_local, is_pwd, other=0):
+    return (FLAG_LOCAL if is_local else 0) | (FLAG_PWD if is_pwd else 0) | other
+
+def test_price_matches_baseline_for_every_combination():
+    for status, is_local, is_pwd, is_summer in itertools.product(ALL_STATUSES, *[(False, True)] * 3):
+        expected = baseline_fare(status, is_local, is_pwd, is_summer)
+        assert FARES.price(status, is_local, is_pwd, is_summer) == expected, (status, is_local, is_pwd, is_summer)
+        assert reference_price(status, is_local, is_pwd, is_summer) == expected, (status, is_local, is_pwd, is_summer)
+
+def test_base_fare_matches_baseline():
+    for status, is_summer in itertools.product(ALL_STATUSES, (False, True)):
+        assert FARES.base_fare(status, is_summer) == baseline_fare(status, True, False, is_summer)[0]
+
+def test_price_columns_ignores_payment_and_boarding_flags():
+    status_values = list(ALL_STATUSES)
+    for code, (is_local, is_pwd, is_summer, other) in itertools.product(
+            range(len(status_values)), itertools.product((False, True), (False, True), (False, True), OTHER_FLAGS)):
+        fares = FARES.price_columns([code], [flags_for(is_local, is_pwd, other)], status_values, is_summer)
+        assert fares[0] == baseline_fare(status_values[code], is_local, is_pwd, is_summer)[2]
+
+def test_price_columns_matches_baseline_on_random_batches():
+    rng = random.Random(20260401)
+    status_values = list(ALL_STATUSES)
+    for _ in range(200):
+        size = rng.randint(0, 300)
+        codes = [rng.randrange(len(status_values)) for _ in range(size)]
+        flags = [flags_for(rng.random() < 0.5, rng.random() < 0.2, rng.choice(OTHER_FLAGS)) for _ in range(size)]
+        is_summer = rng.random() < 0.5
+        expected = [baseline_fare(status_values[code], bool(flag & FLAG_LOCAL), bool(flag & FLAG_PWD),
+                                  is_summer)[2]
+                    for code, flag in zip(codes, flags)]
+        assert list(FARES.price_columns(codes, flags, status_values, is_summer)) == expected
+
+        # Only some rows, as set_summer reprices just the unpaid ones
+        rows = sorted(rng.sample(range(size), rng.randint(0, size)))
+        assert list(FARES.price_columns(codes, flags, status_values, is_summer, rows)) == [expected[r] for r in rows]
@@ -0,0 +1,58 @@
+"""SearchIndex must find every name its typo budget allows
+
+    python -m pytest tests
+"""
+import itertools
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ferry_search import SearchIndex, max_typos, normalize, prefix_distance
+from ferry_table import TravelerTable
+
+FIRST_NAMES = ["Jose", "Pedro", "Maria", "Juan", "Ana", "Josefina", "Rosario", "Ramon", "Teresita", "Jun"]
+LAST_NAMES = ["Santos", "Reyes", "Cruz", "Bautista", "Ocampo", "Garcia", "Mendoza", "Dela Cruz", "Aquino", "Ramos"]
+
+def make_index(names):
+    table = TravelerTable()
+    for traveler_id, name in enumerate(names, 1):
+        table.append({"traveler_id": traveler_id, "name": name, "status": "Regular", "destination": "Iloilo",
+                      "fare": 210.0, "is_local": False, "qr_filename": ""})
+    return SearchIndex(table)
+
+def found_names(index, query):
+    return {traveler.name for traveler in index.search(query, limit=len(index.table))}
+
+def test_swaps_and_first_letter_typos():
+    names = [f"{first} {last}" for first, last in itertools.product(FIRST_NAMES, LAST_NAMES)]
+    # Many unrelated names sharing the first letters, so common trigrams cannot do the work
+    rng = random.Random(7)
+    names += [rng.choice("jpmsr") + "".join(rng.choice("aeiouxyz") for _ in range(5)) + " Tan"
+              for _ in range(3000)]
+    index = make_index(names)
+    for query, expected in [("jsoe", "Jose Santos"), ("Pdero", "Pedro Cruz"), ("Mraia", "Maria Reyes"),
+                            ("Snatos", "Juan Santos"), ("Jsoe Reyes", "Jose Reyes"), ("Xose", "Jose Cruz"),
+                            ("Oedro", "Pedro Ramos"), ("aMria", "Maria Garcia"), ("Ojse Santos", "Jose Santos"),
+                            ("Bautitsa", "Ana Bautista"), ("Abutitsa", "Ana Bautista")]:
+        assert expected in found_names(index, query), query
+    assert found_names(index, "Jsoe Reyes") == {"Jose Reyes", "Josefina Reyes"}
+
+def test_typo_search_misses_nothing_prefix_distance_accepts():
+    rng = random.Random(20260401)
+    names = ["".join(rng.choice("abcdeor") for _ in range(rng.randint(3, 9))) for _ in range(1000)]
+    index = make_index(names)
+    for _ in range(150):
+        word = rng.choice(names)
+        query = list(word[:rng.randint(4, len(word))] if len(word) > 4 else word)
+        for _ in range(rng.randint(0, 2)):
+            i = rng.randrange(len(query))
+            if rng.random() < 0.5 and i + 1 < len(query):
+                query[i], query[i + 1] = query[i + 1], query[i]
+            else:
+                query[i] = rng.choice("abcdeorx")
+        query = "".join(query)
+        limit = max_typos(query)
+        expected = {name for name in names if prefix_distance(query, normalize(name)[0], limit) <= limit}
+        assert found_names(index, query) == expected, query